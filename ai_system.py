@@ -4,66 +4,99 @@ import time
 import json
 import os
 import asyncio
-try:
-    import pygame
-except ImportError:
-    import pygame_ce as pygame
+import io
+import tempfile
 from datetime import datetime
 try:
     import edge_tts
 except ImportError:
     edge_tts = None
+from speech_pipeline import SpeechPipeline, SentenceSplitter
+from audio_engine import get_playback_engine
+from tts_cache import TTSCache
+from search_executor import get_search_executor
+from search_cache import SearchCache
+from http_client import http_get
+from ingestion import chunk_text, iter_document_text, iter_url_text
+from topics import analyze_text, topic_terms
+from knowledge_store import KnowledgeStore, ScoreWriter
+from bulk_feed import BulkFeeder
+from enrichment import EnrichmentQueue
+from knowledge_index import KnowledgeIndex
+from vector_index import VectorIndex
+from model_registry import get_model_registry
+from model_lifecycle import ModelLifecycle
+from conversation import Conversation
+from context_builder import ContextBuilder, estimate_tokens, messages_tokens
+from response_length import ResponseLengthController, SentenceTrimmer, STOP_SEQUENCES
+
+WELCOME_MESSAGE = "Hello! I'm ΛI-NEXUS, your self-improving AI assistant. Feed me data with 'feed [text/url/file/image]' and I'll learn from it! How can I help you?"
+GOODBYE_MESSAGE = "Goodbye! Your settings are saved and protected."
+FEED_SUCCESS_PREFIX = "I've learned from that data!"
+FEED_FAILED_MESSAGE = "I had trouble processing that data. Please try again."
+RESET_MESSAGE = "I've been reset to default settings."
+CLEANUP_PREFIX = "System optimized!"
+SEARCH_RESULTS_HEADER = "=== CURRENT WEB SEARCH RESULTS ==="
+
+# Seconds each search provider gets before its results are dropped
+SEARCH_DEADLINES = {'web': 8, 'wikipedia': 4, 'github': 5, 'arxiv': 6}
+
+# Spoken often enough that their audio is synthesized ahead of time
+SYSTEM_PHRASES = [WELCOME_MESSAGE, GOODBYE_MESSAGE, FEED_SUCCESS_PREFIX, FEED_FAILED_MESSAGE, RESET_MESSAGE, CLEANUP_PREFIX]
 
 class DefaultAISystem:
     def __init__(self):
         print("🤖 Initializing Self-Healing AI System...")
         
-        # Auto-cleanup on startup
-        self.auto_cleanup()
-        
         # Initialize all variables first
         self.error_count = 0
         self.max_errors = 3
         self.last_heal_time = time.time()
         self.health_status = "healthy"
-        self.conversation_history = []
+        self.conversation = Conversation()
         self.learning_score = 0
         self.edge_available = False
+        self.speech_pipeline = None
+        self.tts_cache = TTSCache()
+        self.system_sentences = set(self.system_speech_sentences())
+        self.search_cache = SearchCache()
+        self.length_controller = ResponseLengthController()
         
         # Load settings
         self.settings = self.load_default_settings()
         
-        # Load knowledge base
-        self.knowledge_base = self.load_knowledge_base()
+        # Start loading the model in the background while the rest starts up
+        self.model_lifecycle = ModelLifecycle(self.settings["keep_alive"])
+        self.model = self.get_model()
+        
+        # Open the knowledge base; entries are paged in as retrieval needs them
+        self.knowledge_store = self.load_knowledge_base()
+        self.knowledge_index = KnowledgeIndex(self.knowledge_store)
+        self.score_writer = ScoreWriter(self.knowledge_store)
+        self.vector_index = self.setup_vector_index()
+        self.enrichment = EnrichmentQueue(self.knowledge_store, self.search_related)
         
         # Setup components
         self.setup_edge_tts()
-        self.model = self.get_model()
         
         print(f"✅ Self-Healing AI System Ready - Model: {self.model}")
     
     def load_knowledge_base(self):
-        """Load AI knowledge base"""
+        """Open the AI knowledge base without reading entry bodies"""
         try:
-            if os.path.exists('ai_knowledge_base.json'):
-                with open('ai_knowledge_base.json', 'r') as f:
-                    return json.load(f)
-        except:
-            pass
+            store = KnowledgeStore()
+            print(f"📚 Knowledge base: {store.count()} entries")
+            return store
+        except Exception as e:
+            print(f"Knowledge load error: {e}")
         
-        return {
-            'fed_data': [],
-            'learned_concepts': {},
-            'reinforcement_scores': {},
-            'last_update': datetime.now().isoformat()
-        }
+        # Keep running with an empty in-memory base
+        return KnowledgeStore(':memory:', legacy_json=None)
     
     def save_knowledge_base(self):
-        """Save knowledge base"""
+        """Write pending usage count and reinforcement score changes"""
         try:
-            self.knowledge_base['last_update'] = datetime.now().isoformat()
-            with open('ai_knowledge_base.json', 'w') as f:
-                json.dump(self.knowledge_base, f, indent=2)
+            self.score_writer.flush()
         except Exception as e:
             print(f"Knowledge save error: {e}")
     
@@ -72,96 +105,115 @@ class DefaultAISystem:
         try:
             print(f"🍽️ Feeding {data_type} data to AI...")
             
-            # Process different data types
-            if data_type == "url":
-                content = self.extract_url_content(data_input)
-            elif data_type == "file":
-                content = self.extract_file_content(data_input)
-            elif data_type == "image":
-                content = self.extract_image_text(data_input)
-            else:
-                content = data_input
+            # Chunk, analyze and store the whole document
+            first_id, chunk_count, key_topics = self.ingest(data_input, data_type)
             
-            if not content:
+            if not chunk_count:
                 print("❌ No content extracted")
                 return False
             
-            # Analyze content
-            analysis = self.analyze_content(content)
-            
-            # Search for related information
-            related_info = self.search_related_topics(analysis['key_topics'])
-            
-            # Store in knowledge base
-            knowledge_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'content': content[:1000],  # Store first 1000 chars
-                'analysis': analysis,
-                'related_searches': related_info,
-                'reinforcement_score': 1.0,
-                'usage_count': 0
-            }
-            
-            self.knowledge_base['fed_data'].append(knowledge_entry)
-            
-            # Update learned concepts
-            for topic in analysis['key_topics']:
-                if topic in self.knowledge_base['learned_concepts']:
-                    self.knowledge_base['learned_concepts'][topic] += 1
-                else:
-                    self.knowledge_base['learned_concepts'][topic] = 1
-            
-            self.save_knowledge_base()
-            self.learning_score += 1
-            
-            print(f"✅ Data fed successfully! Learning score: {self.learning_score}")
-            print(f"📚 Key topics learned: {', '.join(analysis['key_topics'][:3])}")
+            # Related searches run later in the background; the entries are usable now
+            self.enrichment.submit(first_id, key_topics)
             
+            self.report_feed(chunk_count, key_topics)
             return True
             
         except Exception as e:
             print(f"Data feeding error: {e}")
             return False
     
-    def extract_url_content(self, url):
-        """Extract content from URL"""
-        try:
-            import requests
-            from bs4 import BeautifulSoup
-            
-            response = requests.get(url, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Get text content
-            text = soup.get_text()
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            return text[:2000]  # Limit to 2000 chars
-            
-        except Exception as e:
-            print(f"URL extraction error: {e}")
-            return None
+    def ingest(self, data_input, data_type="text"):
+        """Store every chunk of a document; returns (first entry id, chunk count, top document topics)
+        
+        The source is read as a stream and split into overlapping chunks, so
+        long documents are covered in full without being held in memory.
+        Stored entries are not kept around; only the first id is needed.
+        """
+        source = data_input if data_type in ("url", "file", "image") else None
+        first_id = None
+        chunk_count = 0
+        topic_counts = {}
+        
+        for index, chunk in enumerate(chunk_text(self.iter_content(data_input, data_type))):
+            analysis = self.analyze_content(chunk)
+            entry = self.store_knowledge(chunk, analysis, [], source=source, chunk=index)
+            if first_id is None:
+                first_id = entry['id']
+            chunk_count += 1
+            for topic in analysis['key_topics']:
+                topic_counts[topic] = topic_counts.get(topic, 0) + 1
+        
+        key_topics = sorted(topic_counts, key=topic_counts.get, reverse=True)[:5]
+        return first_id, chunk_count, key_topics
     
-    def extract_file_content(self, file_path):
-        """Extract content from file"""
+    def iter_content(self, data_input, data_type="text"):
+        """Yield the text of a data source in pieces"""
+        image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']
+        
+        if data_type == "url":
+            return iter_url_text(data_input)
+        if data_type == "image" or (data_type == "file" and any(data_input.lower().endswith(ext) for ext in image_extensions)):
+            text = self.extract_image_text(data_input)
+            return [text] if text else []
+        if data_type == "file":
+            return iter_document_text(data_input)
+        return [data_input]
+    
+    def store_knowledge(self, content, analysis, related_info, **fields):
+        """Store an analyzed entry in the knowledge base and return it"""
+        knowledge_entry = {
+            'timestamp': datetime.now().isoformat(),
+            'content': content,
+            'analysis': analysis,
+            'related_searches': related_info,
+            'reinforcement_score': 1.0,
+            'usage_count': 0
+        }
+        knowledge_entry.update({key: value for key, value in fields.items() if value is not None})
+        
+        # One insert also indexes it; the rest of the base is not rewritten
+        knowledge_entry['id'] = self.knowledge_store.add_entry(knowledge_entry)
+        if self.vector_index is not None:
+            try:
+                self.vector_index.add(knowledge_entry['id'], knowledge_entry['content'])
+            except Exception as e:
+                print(f"Embedding error: {e}")
+        
+        return knowledge_entry
+    
+    def bulk_feed(self, target, workers=8, batch_size=200):
+        """Feed every document in a directory, glob, sitemap or URL list; returns stats or None on failure"""
         try:
-            # Check if it's an image file
-            image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']
-            if any(file_path.lower().endswith(ext) for ext in image_extensions):
-                return self.extract_image_text(file_path)
-            
-            # Regular text file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()[:2000]
+            # Entries are searchable as soon as their batch commits; only embeddings lag
+            on_batch = self.vector_index.backfill if self.vector_index is not None else None
+            feeder = BulkFeeder(
+                self.knowledge_store, workers=workers, batch_size=batch_size, on_batch=on_batch,
+                tfidf=self.settings.get("tfidf_topics", False)
+            )
+            stats = feeder.run(target)
         except Exception as e:
-            print(f"File extraction error: {e}")
+            print(f"Bulk feeding error: {e}")
             return None
+        if stats['documents']:
+            self.learning_score += 1
+        return stats
+    
+    def bulk_feed_message(self, stats):
+        """What to say after a bulk feed"""
+        if stats is None:
+            return FEED_FAILED_MESSAGE
+        return f"{FEED_SUCCESS_PREFIX} Fed {stats['documents']} documents as {stats['chunks']} entries, {stats['failed']} failed."
+    
+    def cache_stats_message(self):
+        """Summary of search cache hits and misses per provider"""
+        stats = ', '.join(f"{provider}: {counts['hits']} hits / {counts['misses']} misses" for provider, counts in self.search_cache.stats().items())
+        return f"Search cache stats: {stats or 'no searches yet'}"
+    
+    def report_feed(self, chunk_count, key_topics):
+        self.learning_score += 1
+        
+        print(f"✅ Data fed successfully! Stored {chunk_count} chunk(s). Learning score: {self.learning_score}")
+        print(f"📚 Key topics learned: {', '.join(key_topics[:3])}")
     
     def extract_image_text(self, image_path):
         """Extract text from image using OCR"""
@@ -179,7 +231,7 @@ class DefaultAISystem:
             
             if extracted_text.strip():
                 print(f"✅ Extracted {len(extracted_text)} characters from image")
-                return extracted_text[:2000]  # Limit to 2000 chars
+                return extracted_text
             else:
                 print("⚠️ No text found in image")
                 return None
@@ -194,75 +246,73 @@ class DefaultAISystem:
     
     def analyze_content(self, content):
         """Analyze content to extract key information"""
+        if self.settings.get("tfidf_topics", False):
+            # Rank topics against how many fed documents already use each word
+            frequencies, document_count = self.knowledge_store.document_frequencies(set(topic_terms(content)))
+            return analyze_text(content, frequencies, document_count)
+        return analyze_text(content)
+    
+    def search_related(self, topic):
+        """Search for information related to an extracted topic"""
+        print(f"🔍 Searching related info for: {topic}")
+        return self.search_web(f"what is {topic}")
+    
+    def setup_vector_index(self):
+        """Setup the optional embedding index for semantic retrieval"""
+        if not self.settings.get("semantic_search", False):
+            return None
+        
+        embedding_model = self.settings.get("embedding_model", "nomic-embed-text")
         try:
-            # Simple keyword extraction
-            words = content.lower().split()
-            
-            # Filter common words
-            stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should'}
-            
-            filtered_words = [word for word in words if word not in stop_words and len(word) > 3]
-            
-            # Count word frequency
-            word_count = {}
-            for word in filtered_words:
-                word_count[word] = word_count.get(word, 0) + 1
-            
-            # Get top keywords
-            key_topics = sorted(word_count.items(), key=lambda x: x[1], reverse=True)[:5]
-            key_topics = [topic[0] for topic in key_topics]
-            
-            return {
-                'key_topics': key_topics,
-                'word_count': len(words),
-                'summary': content[:200] + '...' if len(content) > 200 else content
-            }
-            
-        except Exception as e:
-            print(f"Content analysis error: {e}")
-            return {'key_topics': [], 'word_count': 0, 'summary': ''}
+            vector_index = VectorIndex(lambda text: ollama.embeddings(model=embedding_model, prompt=text)['embedding'])
+        except ImportError as e:
+            print(f"❌ Semantic search disabled: {e}")
+            return None
+        
+        # Embed entries fed before semantic search was enabled; skip the scan when every entry has a row
+        if len(vector_index.ids) != self.knowledge_store.count():
+            vector_index.backfill(self.knowledge_store.iter_entries())
+        print(f"🧭 Semantic search ready - Model: {embedding_model}")
+        return vector_index
     
-    def search_related_topics(self, topics):
-        """Search for information related to extracted topics"""
-        related_info = []
+    def use_semantic_knowledge(self, query, exclude_ids=()):
+        """Find fed entries whose embeddings are closest to the query"""
+        if self.vector_index is None:
+            return []
         
-        for topic in topics[:2]:  # Search top 2 topics
-            try:
-                print(f"🔍 Searching related info for: {topic}")
-                search_results = self.search_web(f"what is {topic}")
-                if search_results:
-                    related_info.extend(search_results[:1])  # Take 1 result per topic
-            except:
-                continue
+        try:
+            matches = self.vector_index.search(query, limit=2)
+        except Exception as e:
+            print(f"Semantic search error: {e}")
+            return []
         
-        return related_info
+        entries = []
+        for entry_id, _ in matches:
+            entry = self.knowledge_store.record(entry_id)
+            if entry is not None and entry_id not in exclude_ids:
+                entries.append(entry)
+        return entries
     
     def use_fed_knowledge(self, query):
         """Use fed knowledge to enhance responses"""
-        relevant_knowledge = []
-        query_words = query.lower().split()
+        candidates = {}
         
         # Special handling for identity queries about Shaik Davood
         if any(word in query.lower() for word in ['shaik', 'davood', 'creator', 'who created', 'who made', 'who is']):
-            for entry in self.knowledge_base['fed_data']:
-                if any(word in entry['content'].lower() for word in ['shaik', 'davood', 'mechanical', 'engineering', 'nbkr']):
-                    relevant_knowledge.append(entry)
-                    entry['usage_count'] += 1
-                    entry['reinforcement_score'] += 0.2
-        
-        # General knowledge search
-        for entry in self.knowledge_base['fed_data']:
-            for topic in entry['analysis']['key_topics']:
-                if any(word in topic for word in query_words):
-                    if entry not in relevant_knowledge:
-                        relevant_knowledge.append(entry)
-                        entry['usage_count'] += 1
-                        entry['reinforcement_score'] += 0.1
-                    break
+            for entry in self.knowledge_index.search('shaik davood mechanical engineering nbkr', limit=2):
+                candidates[entry.id] = (entry, 0.2)
+        
+        # General knowledge search through the inverted index
+        for entry in self.knowledge_index.search(query, limit=2):
+            candidates.setdefault(entry.id, (entry, 0.1))
         
-        # Sort by reinforcement score
-        relevant_knowledge.sort(key=lambda x: x['reinforcement_score'], reverse=True)
-        return relevant_knowledge[:2]
+        # Sort by reinforcement score and reinforce only what is actually used
+        relevant = sorted(candidates.values(), key=lambda pair: pair[0].reinforcement_score, reverse=True)[:2]
+        for entry, reward in relevant:
+            entry.usage_count += 1
+            entry.reinforcement_score += reward
+            self.score_writer.record(entry.id, 1, reward)
+        return [entry for entry, _ in relevant]
     
     def load_default_settings(self):
         """Load settings or create defaults"""
@@ -274,7 +324,13 @@ class DefaultAISystem:
             "response_length": 150,
             "temperature": 0.7,
             "ai_name": "ΛI-NEXUS",
-            "auto_reset": True
+            "auto_reset": True,
+            "semantic_search": False,
+            "tfidf_topics": False,
+            "embedding_model": "nomic-embed-text",
+            "keep_alive": "30m",
+            "context_window": 2048,
+            "context_budget": 1024
         }
         
         try:
@@ -302,25 +358,6 @@ class DefaultAISystem:
         except:
             pass
     
-    def auto_cleanup(self):
-        """Automatic cleanup on startup"""
-        cleaned = 0
-        
-        # Remove temp speech files
-        try:
-            for file in os.listdir('.'):
-                if file.startswith('temp_speech_') and file.endswith('.mp3'):
-                    try:
-                        os.remove(file)
-                        cleaned += 1
-                    except:
-                        pass
-        except:
-            pass
-        
-        if cleaned > 0:
-            print(f"🧹 Auto-cleaned {cleaned} temporary files")
-    
     def smart_cleanup(self):
         """Smart cleanup of unwanted files"""
         print("🧹 Running smart cleanup...")
@@ -344,8 +381,7 @@ class DefaultAISystem:
         # Remove temp speech files
         try:
             for file in os.listdir('.'):
-                if (file.startswith('temp_speech_') and file.endswith('.mp3') and 
-                    file != f"temp_speech_{int(time.time())}.mp3"):  # Keep current
+                if file.startswith('temp_speech_') and file.endswith('.mp3'):
                     try:
                         os.remove(file)
                         removed += 1
@@ -366,7 +402,7 @@ class DefaultAISystem:
         except:
             pass
         
-        return f"System optimized! Cleaned {removed} unwanted files for smoother performance."
+        return f"{CLEANUP_PREFIX} Cleaned {removed} unwanted files for smoother performance."
     
     def reset_to_defaults(self):
         """Reset system to default settings"""
@@ -380,7 +416,13 @@ class DefaultAISystem:
             "response_length": 150,
             "temperature": 0.7,
             "ai_name": "ΛI-NEXUS",
-            "auto_reset": True
+            "auto_reset": True,
+            "semantic_search": False,
+            "tfidf_topics": False,
+            "embedding_model": "nomic-embed-text",
+            "keep_alive": "30m",
+            "context_window": 2048,
+            "context_budget": 1024
         }
         
         self.settings = default_settings
@@ -400,7 +442,7 @@ class DefaultAISystem:
             self.smart_cleanup()
             
             # Reset components
-            self.conversation_history = []
+            self.conversation.clear()
             self.learning_score = 0
             
             # Setup components
@@ -432,7 +474,7 @@ class DefaultAISystem:
             # Quick heal for specific component
             if "model" in error_type.lower():
                 print("🤖 Healing AI model...")
-                self.model = self.get_model()
+                self.model = self.get_model(refresh=True)
             
             self.health_status = "recovering"
     
@@ -450,12 +492,20 @@ class DefaultAISystem:
         
         try:
             self.voice = self.settings["voice"]
+            self.audio_engine = get_playback_engine()
+            if self.speech_pipeline is None:
+                self.speech_pipeline = self.create_speech_pipeline()
             print(f"🔊 Edge TTS ready - Voice: {self.voice}")
             self.edge_available = True
+            self.prewarm_speech()
         except Exception as e:
             print(f"❌ TTS error: {e}")
             self.edge_available = False
     
+    def create_speech_pipeline(self):
+        """Create the sentence-by-sentence speech pipeline"""
+        return SpeechPipeline(self._synthesize_sentence, self._play_speech_audio)
+    
     def speak_edge(self, text):
         """Speak using Edge neural TTS with error recovery"""
         if not self.edge_available:
@@ -463,91 +513,105 @@ class DefaultAISystem:
         
         try:
             print("🗣️ Speaking...")
-            asyncio.run(self._generate_speech(text))
+            self.speech_pipeline.speak(self._clean_speech_text(text))
             print("✅ Speech done")
         except Exception as e:
             print(f"Speech error: {e}")
             # Don't trigger auto-healing for speech errors
             pass
     
+    def _clean_speech_text(self, text):
+        """Clean text for speech"""
+        return text.replace('\n', ' ').replace('\r', ' ').strip()
+    
+    def system_speech_sentences(self):
+        """The fixed system phrases split into the sentences the speech pipeline speaks"""
+        sentences = []
+        for phrase in SYSTEM_PHRASES:
+            # Split the same way the speech pipeline does so the cache keys match
+            splitter = SentenceSplitter()
+            sentences.extend(splitter.feed(self._clean_speech_text(phrase)))
+            rest = splitter.flush()
+            if rest:
+                sentences.append(rest)
+        return sentences
+    
+    def prewarm_speech(self):
+        """Synthesize the fixed system phrases into the TTS cache in the background"""
+        uncached = [sentence for sentence in self.system_sentences if self.tts_cache.get(self.voice, sentence) is None]
+        if uncached:
+            self.tts_cache.prewarm(uncached, self._synthesize_sentence)
+    
+    def _synthesize_sentence(self, sentence):
+        """Synthesize one sentence on the speech pipeline's synthesis worker"""
+        return asyncio.run(self._generate_speech(sentence))
+    
     async def _generate_speech(self, text):
-        """Generate speech with Edge TTS"""
-        # Clean text for speech
-        clean_text = text.replace('\n', ' ').replace('\r', ' ').strip()
+        """Generate speech with Edge TTS into an in-memory MP3 buffer"""
+        clean_text = self._clean_speech_text(text)
         if not clean_text:
-            return
-            
+            return None
+        
+        cached = self.tts_cache.get(self.voice, clean_text)
+        if cached is not None:
+            return io.BytesIO(cached)
+        
         communicate = edge_tts.Communicate(clean_text, self.voice)
-        temp_file = f"temp_speech_{int(time.time())}.mp3"
+        audio = io.BytesIO()
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                audio.write(chunk["data"])
+        # Only the fixed system phrases are worth keeping on disk; reply
+        # sentences stay in the in-memory LRU
+        self.tts_cache.put(self.voice, clean_text, audio.getvalue(), persist=clean_text in self.system_sentences)
+        audio.seek(0)
+        return audio
+    
+    def _play_speech_audio(self, audio):
+        """Play a synthesized speech buffer on the speech pipeline's playback worker"""
+        import sys
         
-        try:
-            await communicate.save(temp_file)
-            
-            import subprocess
-            import sys
-            
+        if self.audio_engine.available:
+            self.audio_engine.play(audio)
+        elif sys.platform == "win32":
+            # Fallback to system player, which needs a real file
+            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as f:
+                f.write(audio.getvalue())
             try:
-                pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-                pygame.mixer.music.load(temp_file)
-                pygame.mixer.music.play()
-                
-                while pygame.mixer.music.get_busy():
-                    await asyncio.sleep(0.1)
-            except:
-                # Fallback to system player
-                if sys.platform == "win32":
-                    os.startfile(temp_file)
-                    await asyncio.sleep(3)
-                
-        finally:
-            try:
-                pygame.mixer.music.stop()
-                pygame.mixer.quit()
-            except:
-                pass
-            if os.path.exists(temp_file):
+                os.startfile(f.name)
+                time.sleep(3)
+            finally:
                 try:
-                    os.remove(temp_file)
-                except:
-                    pass
+                    os.remove(f.name)
+                except OSError:
+                    pass  # Still open in the player
     
-    def get_model(self):
+    def get_model(self, refresh=False):
         """Get working AI model with fallback"""
-        try:
-            model = self.settings["ai_model"]
-            ollama.generate(model=model, prompt='test', options={'num_predict': 1})
-            return model
-        except:
-            # Try fallback models
-            for model in ['phi3:mini', 'gemma:2b', 'llama2:latest']:
-                try:
-                    ollama.generate(model=model, prompt='test', options={'num_predict': 1})
-                    self.settings["ai_model"] = model
-                    return model
-                except:
-                    continue
-            return 'phi3:mini'
+        # Installed models come from the registry's cached list, not a test generation
+        model = get_model_registry().choose(self.settings["ai_model"], refresh=refresh)
+        if model != self.settings["ai_model"]:
+            print(f"⚠️ Model {self.settings['ai_model']} not installed, using {model}")
+            self.settings["ai_model"] = model
+        self.model_lifecycle.switch(model, {'num_ctx': self.context_window(model)})
+        return model
     
     def search_web(self, query):
-        """Search web with multiple fallback methods"""
+        """Search web, hedging the primary DDGS search with its fallbacks"""
         if not self.settings["search_enabled"]:
             return []
         
-        # Try multiple search methods
+        # Fallbacks start when the previous method fails, returns nothing or is slow
         search_methods = [
-            self._search_ddgs,
-            self._search_ddgs_lite,
-            self._search_fallback
+            lambda: self._search_ddgs(query),
+            lambda: self._search_ddgs_lite(query),
+            lambda: self._search_fallback(query)
         ]
         
-        for method in search_methods:
-            try:
-                results = method(query)
-                if results:
-                    print(f"🔍 Found {len(results)} results")
-                    return results
-            except Exception as e:
-                continue
+        results = self.search_cache.cached('web', query, lambda: get_search_executor().hedged(search_methods, hedge_delay=1.5, timeout=10))
+        if results:
+            print(f"🔍 Found {len(results)} results")
+            return results
         
         print("📚 Working offline - using AI knowledge")
         return []
@@ -579,13 +643,10 @@ class DefaultAISystem:
             return results
     
     def _search_fallback(self, query):
-        """Fallback search using requests"""
-        import requests
-        import json
-        
+        """Fallback search using the DuckDuckGo instant answer API"""
         # Simple fallback search
         url = f"https://api.duckduckgo.com/?q={query}&format=json&no_html=1&skip_disambig=1"
-        response = requests.get(url, timeout=5)
+        response = http_get(url, timeout=5)
         data = response.json()
         
         results = []
@@ -599,63 +660,79 @@ class DefaultAISystem:
     
     def search_github(self, query):
         """Search GitHub repositories"""
+        return self.search_cache.cached('github', query, lambda: self._search_github(query))
+    
+    def _search_github(self, query):
+        """Search GitHub repositories without the cache"""
         try:
-            import requests
             url = f"https://api.github.com/search/repositories?q={query}&sort=stars&order=desc"
-            response = requests.get(url)
-            data = response.json()
-            
-            results = []
-            for repo in data.get('items', [])[:3]:
-                results.append({
-                    'name': repo['name'],
-                    'description': repo.get('description', 'No description'),
-                    'url': repo['html_url'],
-                    'stars': repo['stargazers_count']
-                })
-            return results
+            response = http_get(url, timeout=5)
+            return self.parse_github_results(response.json())
         except:
             return []
     
+    def parse_github_results(self, data):
+        """Parse a GitHub repository search response"""
+        results = []
+        for repo in data.get('items', [])[:3]:
+            results.append({
+                'name': repo['name'],
+                'description': repo.get('description', 'No description'),
+                'url': repo['html_url'],
+                'stars': repo['stargazers_count']
+            })
+        return results
+    
     def search_arxiv(self, query):
         """Search arXiv papers"""
+        return self.search_cache.cached('arxiv', query, lambda: self._search_arxiv(query))
+    
+    def _search_arxiv(self, query):
+        """Search arXiv papers without the cache"""
         try:
-            import requests
-            import xml.etree.ElementTree as ET
-            
             url = f"http://export.arxiv.org/api/query?search_query=all:{query}&start=0&max_results=3"
-            response = requests.get(url)
-            root = ET.fromstring(response.content)
-            
-            results = []
-            for entry in root.findall('{http://www.w3.org/2005/Atom}entry'):
-                title = entry.find('{http://www.w3.org/2005/Atom}title').text
-                summary = entry.find('{http://www.w3.org/2005/Atom}summary').text[:200]
-                results.append({'title': title, 'summary': summary})
-            return results
+            response = http_get(url, timeout=6)
+            return self.parse_arxiv_results(response.content)
         except:
             return []
     
+    def parse_arxiv_results(self, content):
+        """Parse an arXiv Atom feed"""
+        import xml.etree.ElementTree as ET
+        
+        root = ET.fromstring(content)
+        
+        results = []
+        for entry in root.findall('{http://www.w3.org/2005/Atom}entry'):
+            title = entry.find('{http://www.w3.org/2005/Atom}title').text
+            summary = entry.find('{http://www.w3.org/2005/Atom}summary').text[:200]
+            results.append({'title': title, 'summary': summary})
+        return results
+    
     def search_wikipedia(self, query):
         """Search Wikipedia"""
+        return self.search_cache.cached('wikipedia', query, lambda: self._search_wikipedia(query))
+    
+    def _search_wikipedia(self, query):
+        """Search Wikipedia without the cache"""
         try:
-            import requests
-            
             # Search for articles
             search_url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{query}"
-            response = requests.get(search_url)
-            data = response.json()
-            
-            if 'extract' in data:
-                return [{
-                    'title': data['title'],
-                    'content': data['extract'][:300],
-                    'url': data.get('content_urls', {}).get('desktop', {}).get('page', '')
-                }]
-            return []
+            response = http_get(search_url, timeout=4)
+            return self.parse_wikipedia_result(response.json())
         except:
             return []
     
+    def parse_wikipedia_result(self, data):
+        """Parse a Wikipedia page summary response"""
+        if 'extract' in data:
+            return [{
+                'title': data['title'],
+                'content': data['extract'][:300],
+                'url': data.get('content_urls', {}).get('desktop', {}).get('page', '')
+            }]
+        return []
+    
     def should_search(self, user_input):
         """AI decides if search is needed"""
         # Simple keyword-based search detection
@@ -669,110 +746,181 @@ class DefaultAISystem:
         return any(trigger in user_lower for trigger in search_triggers)
     
     def auto_search(self, user_input):
-        """Automatically search multiple sources"""
-        all_results = []
+        """Search every applicable source at once and merge what arrives in time"""
+        user_lower = user_input.lower()
         
-        # Search web
-        web_results = self.search_web(user_input)
-        all_results.extend(web_results)
+        # (name, search, deadline in seconds), in the order results are merged
+        providers = [('web', lambda: self.search_web(user_input), SEARCH_DEADLINES['web'])]
         
         # Search Wikipedia for factual questions
-        if any(word in user_input.lower() for word in ['what', 'who', 'when', 'where', 'how']):
-            wiki_results = self.search_wikipedia(user_input)
-            all_results.extend(wiki_results)
+        if any(word in user_lower for word in ['what', 'who', 'when', 'where', 'how']):
+            providers.append(('wikipedia', lambda: self.search_wikipedia(user_input), SEARCH_DEADLINES['wikipedia']))
         
         # Search GitHub for code/tech questions
-        if any(word in user_input.lower() for word in ['code', 'programming', 'software', 'library', 'framework']):
-            github_results = self.search_github(user_input)
-            if github_results:
-                all_results.extend([{'title': f"GitHub: {r['name']}", 'content': f"{r['description']} - {r['url']}"} for r in github_results])
+        if any(word in user_lower for word in ['code', 'programming', 'software', 'library', 'framework']):
+            providers.append(('github', lambda: [{'title': f"GitHub: {r['name']}", 'content': f"{r['description']} - {r['url']}"} for r in self.search_github(user_input)], SEARCH_DEADLINES['github']))
         
         # Search arXiv for research questions
-        if any(word in user_input.lower() for word in ['research', 'study', 'algorithm', 'theory', 'analysis']):
-            arxiv_results = self.search_arxiv(user_input)
-            if arxiv_results:
-                all_results.extend([{'title': f"Research: {r['title']}", 'content': r['summary']} for r in arxiv_results])
-        
-        return all_results[:5]  # Limit to top 5 results
-    
-    def get_response_length(self, user_input, search_results):
-        """Determine response length based on query complexity"""
-        # Detailed information keywords
-        detailed_keywords = ['explain', 'details', 'information', 'tell me about', 'what is', 'how does', 'describe', 'news', 'current', 'latest']
-        
-        # Check if user wants detailed info
-        wants_details = any(keyword in user_input.lower() for keyword in detailed_keywords)
-        
-        # Check if we have search results (more info available)
-        has_search_data = search_results and len(search_results) > 0
-        
-        if wants_details and has_search_data:
-            return 250  # Long detailed response
-        elif has_search_data:
-            return 180  # Medium response with search data
-        elif wants_details:
-            return 150  # Medium detailed response
-        else:
-            return 80   # Short response
+        if any(word in user_lower for word in ['research', 'study', 'algorithm', 'theory', 'analysis']):
+            providers.append(('arxiv', lambda: [{'title': f"Research: {r['title']}", 'content': r['summary']} for r in self.search_arxiv(user_input)], SEARCH_DEADLINES['arxiv']))
+        
+        return get_search_executor().fan_out(providers, enough=5)  # Limit to top 5 results
     
-    def generate_response(self, user_input, search_results=None):
-        """Generate AI response with adaptive length"""
-        try:
-            # Determine response length based on query
-            response_length = self.get_response_length(user_input, search_results)
-            
-            context = f"You are Lambda I-NEXUS. When search results are provided, ALWAYS use them to answer the question with current information. Do not mention knowledge limitations. Current time: {datetime.now().strftime('%A, %B %d, %Y at %I:%M %p')}\n"
-            
-            # Add fed knowledge to context (only if relevant to query)
-            fed_knowledge = self.use_fed_knowledge(user_input)
-            if fed_knowledge and not any(word in user_input.lower() for word in ['who', 'creator', 'made', 'davood']):
-                context += "KNOWLEDGE:\n"
-                for i, knowledge in enumerate(fed_knowledge, 1):
-                    context += f"{i}. {knowledge['analysis']['summary']}\n"
-            elif fed_knowledge and any(word in user_input.lower() for word in ['who', 'creator', 'made', 'davood']):
-                context += "CREATOR INFO:\n"
-                for i, knowledge in enumerate(fed_knowledge, 1):
-                    context += f"{i}. {knowledge['content'][:200]}\n"
-            
-            if search_results:
-                context += "\n=== CURRENT WEB SEARCH RESULTS ===\n"
-                for i, result in enumerate(search_results, 1):
-                    context += f"Result {i}: {result['title']}\n{result['content'][:400]}\n\n"
-                context += "=== END SEARCH RESULTS ===\n\nIMPORTANT: Use ONLY the above search results to answer. Provide specific details from the search results.\n"
-            
-            if self.conversation_history:
-                context += "Recent conversation:\n"
-                for msg in self.conversation_history[-4:]:
-                    context += f"{msg}\n"
-                context += "\n"
-            
-            if search_results:
-                prompt = f"{context}\nUser Question: {user_input}\n\nAnswer based on the search results above. Be specific and detailed:\nΛI-NEXUS:"
+    def context_window(self, model=None):
+        """Tokens the model sees per request: the configured window, capped by what the model supports"""
+        model_length = get_model_registry().context_length(model or self.model)
+        return min(self.settings["context_window"], model_length or self.settings["context_window"])
+    
+    def build_context(self, user_input, search_results=None, budget=None):
+        """Build the per-turn context that goes after the stable conversation prefix"""
+        context = f"Current time: {datetime.now().strftime('%A, %B %d, %Y at %I:%M %p')}\n"
+        if budget is None:
+            budget = self.settings["context_budget"]
+        
+        # Add fed knowledge to context (only if relevant to query)
+        fed_knowledge = self.use_fed_knowledge(user_input)
+        fed_knowledge += self.use_semantic_knowledge(user_input, exclude_ids={entry['id'] for entry in fed_knowledge})
+        is_creator_query = any(word in user_input.lower() for word in ['who', 'creator', 'made', 'davood'])
+        
+        # Rank everything against the query and keep what fits the token budget
+        builder = ContextBuilder(user_input, budget - estimate_tokens(context))
+        for rank, knowledge in enumerate(fed_knowledge):
+            if is_creator_query:
+                builder.add('creator', knowledge['content'], rank)
             else:
-                prompt = f"{context}\nUser: {user_input}\nΛI-NEXUS:"
-            
-            print(f"📝 Response length: {response_length} tokens")
+                builder.add('knowledge', knowledge['analysis']['summary'], rank)
+        for rank, result in enumerate(search_results or []):
+            builder.add('search', result['content'], rank, title=result['title'])
+        sections = builder.build()
+        
+        if 'knowledge' in sections:
+            context += "KNOWLEDGE:\n"
+            for i, piece in enumerate(sections['knowledge'], 1):
+                context += f"{i}. {piece['text']}\n"
+        elif 'creator' in sections:
+            context += "CREATOR INFO:\n"
+            for i, piece in enumerate(sections['creator'], 1):
+                context += f"{i}. {piece['text']}\n"
+        
+        if 'search' in sections:
+            context += f"\n{SEARCH_RESULTS_HEADER}\n"
+            for i, piece in enumerate(sections['search'], 1):
+                context += f"Result {i}: {piece['title']}\n{piece['text']}\n\n"
+            context += "=== END SEARCH RESULTS ===\n\nIMPORTANT: Use ONLY the above search results to answer. Provide specific details from the search results.\n"
+        
+        return context
+    
+    def build_messages(self, user_input, search_results=None, response_length=0):
+        """Build the chat messages for a user turn within the model's context window"""
+        search_question = f"User Question: {user_input}\n\nAnswer based on the search results above. Be specific and detailed."
+        
+        question = search_question if search_results else user_input
+        window = self.context_window()
+        
+        # Older turns go first if history, question and reply overflow the window
+        fixed = messages_tokens(self.conversation.messages(question))
+        while fixed + response_length > window and self.conversation.drop_oldest():
+            fixed = messages_tokens(self.conversation.messages(question))
+        
+        # Whatever the history, question and reply leave over is the context budget
+        budget = max(0, min(self.settings["context_budget"], window - fixed - response_length))
+        
+        context = self.build_context(user_input, search_results, budget)
+        if SEARCH_RESULTS_HEADER in context:
+            return self.conversation.messages(search_question, context)
+        return self.conversation.messages(user_input, context)
+    
+    def prepare_chat(self, user_input, search_results=None):
+        """Build the chat request for a turn; returns (request, reply) where reply tracks the stream"""
+        # Response length is learned per query class from earlier replies
+        query_class = self.length_controller.classify(user_input, search_results)
+        response_length = self.length_controller.budget(query_class)
+        messages = self.build_messages(user_input, search_results, response_length)
+        
+        print(f"📝 Response length: {response_length} tokens ({query_class}), prompt: ~{messages_tokens(messages)} tokens")
+        
+        # Chat requests share their message prefix with the previous turn,
+        # so Ollama only evaluates the new messages
+        request = {
+            'model': self.model,
+            'messages': messages,
+            'options': {
+                'num_ctx': self.context_window(),
+                'num_predict': response_length,
+                'temperature': self.settings["temperature"],
+                'top_p': 0.9,
+                'stop': STOP_SEQUENCES
+            },
+            'keep_alive': self.model_lifecycle.keep_alive,
+            'stream': True
+        }
+        reply = {
+            'user_input': user_input,
+            'query_class': query_class,
+            'response_length': response_length,
+            'trimmer': SentenceTrimmer(response_length),
+            'chunks': [],
+            'started': False,
+            'eval_count': None,
+            'truncated': False
+        }
+        return request, reply
+    
+    def reply_text(self, reply, part):
+        """Take one streamed chat part; returns the text that can be shown now"""
+        if part.get('done'):
+            reply['eval_count'] = part.get('eval_count')
+            reply['truncated'] = part.get('done_reason') == 'length'
+        token = part['message']['content']
+        if not reply['started']:
+            # Drop the leading whitespace models emit before the answer
+            token = token.lstrip()
+        if not token:
+            return ''
+        reply['started'] = True
+        # Near the cap, text is released a sentence at a time
+        text = reply['trimmer'].feed(token)
+        if text:
+            reply['chunks'].append(text)
+        return text
+    
+    def finish_reply(self, reply):
+        """End a streamed reply, record it and return the text still to show"""
+        rest = reply['trimmer'].finish(reply['truncated'])
+        if rest:
+            reply['chunks'].append(rest)
+        if not reply['started']:
+            return "I'm ΛI-NEXUS, your AI assistant. How can I help you?"
+        
+        generated = reply['eval_count'] or reply['trimmer'].count
+        self.length_controller.record(reply['query_class'], reply['response_length'], generated, reply['truncated'])
+        self.conversation.record(reply['user_input'], ''.join(reply['chunks']).strip())
+        return rest
+    
+    def generate_response_stream(self, user_input, search_results=None):
+        """Generate AI response token by token as the model produces it"""
+        try:
+            request, reply = self.prepare_chat(user_input, search_results)
+            stream = ollama.chat(**request)
+            self.model_lifecycle.touch()
             
-            response = ollama.generate(
-                model=self.model,
-                prompt=prompt,
-                options={
-                    'num_predict': max(response_length, 50),
-                    'temperature': self.settings["temperature"],
-                    'top_p': 0.9
-                }
-            )
+            for part in stream:
+                text = self.reply_text(reply, part)
+                if text:
+                    yield text
             
-            result = response['response'].strip()
-            if not result:
-                result = "I'm ΛI-NEXUS, your AI assistant. How can I help you?"
-            return result
+            rest = self.finish_reply(reply)
+            if rest:
+                yield rest
             
         except Exception as e:
-            error_msg = f"I encountered an error: {str(e)}"
             if hasattr(self, 'settings') and self.settings.get("auto_reset", False):
                 self.auto_heal("model_error")
-            return error_msg
+            yield f"I encountered an error: {str(e)}"
+    
+    def generate_response(self, user_input, search_results=None):
+        """Generate AI response with adaptive length"""
+        return ''.join(self.generate_response_stream(user_input, search_results)).strip()
     
     def run(self):
         """Main AI system loop with error recovery"""
@@ -781,7 +929,7 @@ class DefaultAISystem:
         print("Features: Self-Healing, Neural Voice, AI Auto-Search, Data Feeding, OCR")
         print("="*60)
         
-        welcome = f"Hello! I'm ΛI-NEXUS, your self-improving AI assistant. Feed me data with 'feed [text/url/file/image]' and I'll learn from it! How can I help you?"
+        welcome = WELCOME_MESSAGE
         print(f"\nAI: {welcome}")
         self.speak_edge(welcome)
         
@@ -790,9 +938,12 @@ class DefaultAISystem:
                 user_input = input("\nYou: ").strip()
                 
                 if user_input.lower() in ['exit', 'quit', 'bye']:
-                    goodbye = "Goodbye! Your settings are saved and protected."
+                    goodbye = GOODBYE_MESSAGE
                     print(f"AI: {goodbye}")
                     self.speak_edge(goodbye)
+                    self.enrichment.shutdown()
+                    self.model_lifecycle.release()
+                    self.save_knowledge_base()
                     break
                 
                 elif user_input.lower().startswith('feed '):
@@ -811,24 +962,37 @@ class DefaultAISystem:
                         success = self.feed_data(data, "text")
                     
                     if success:
-                        feed_msg = f"I've learned from that data! My knowledge base now has {len(self.knowledge_base['fed_data'])} entries."
+                        feed_msg = f"{FEED_SUCCESS_PREFIX} My knowledge base now has {self.knowledge_store.count()} entries."
                     else:
-                        feed_msg = "I had trouble processing that data. Please try again."
+                        feed_msg = FEED_FAILED_MESSAGE
                     
                     print(f"AI: {feed_msg}")
                     self.speak_edge(feed_msg)
                     continue
                 
+                elif user_input.lower().startswith('bulk '):
+                    # Bulk feeding: directory, glob, sitemap or URL list file
+                    bulk_msg = self.bulk_feed_message(self.bulk_feed(user_input[5:].strip()))
+                    print(f"AI: {bulk_msg}")
+                    self.speak_edge(bulk_msg)
+                    continue
+                
                 elif user_input.lower() == 'knowledge':
                     # Show knowledge stats
-                    stats = f"Knowledge Base Stats: {len(self.knowledge_base['fed_data'])} entries, Learning score: {self.learning_score}, Top concepts: {list(self.knowledge_base['learned_concepts'].keys())[:3]}"
+                    stats = f"Knowledge Base Stats: {self.knowledge_store.count()} entries, Learning score: {self.learning_score}, Top concepts: {self.knowledge_store.top_concepts(3)}"
                     print(f"AI: {stats}")
                     self.speak_edge(stats)
                     continue
                 
+                elif user_input.lower() == 'cache':
+                    # Show search cache stats
+                    cache_msg = self.cache_stats_message()
+                    print(f"AI: {cache_msg}")
+                    continue
+                
                 elif user_input.lower() == 'reset':
                     self.reset_to_defaults()
-                    reset_msg = "I've been reset to default settings."
+                    reset_msg = RESET_MESSAGE
                     print(f"AI: {reset_msg}")
                     self.speak_edge(reset_msg)
                     continue
@@ -841,9 +1005,7 @@ class DefaultAISystem:
                 
                 if user_input:
                     start_time = time.time()
-                    
-                    # Add to conversation history
-                    self.conversation_history.append(f"User: {user_input}")
+                    self.enrichment.touch()
                     
                     # AI decides if search is needed
                     search_results = []
@@ -853,30 +1015,36 @@ class DefaultAISystem:
                         if not search_results:
                             print("📚 Working offline - using AI knowledge")
                     
-                    # Generate response
-                    response = self.generate_response(user_input, search_results)
-                    
-                    # Add to conversation history
-                    self.conversation_history.append(f"AI: {response}")
-                    
-                    # Keep history manageable
-                    if len(self.conversation_history) > 10:
-                        self.conversation_history = self.conversation_history[-10:]
+                    # Generate response, printing tokens as they arrive
+                    first_token_time = None
+                    print("AI: ", end="", flush=True)
+                    for token in self.generate_response_stream(user_input, search_results):
+                        if first_token_time is None:
+                            first_token_time = time.time() - start_time
+                        print(token, end="", flush=True)
+                        # Speak each sentence as soon as it is complete
+                        if self.edge_available:
+                            self.speech_pipeline.feed(token)
+                    print()
                     
-                    # Show response
+                    # Show timing
                     response_time = time.time() - start_time
                     timestamp = datetime.now().strftime("%H:%M:%S")
-                    print(f"[{timestamp}] Response time: {response_time:.1f}s")
-                    print(f"AI: {response}")
+                    print(f"[{timestamp}] First token: {first_token_time or 0:.1f}s, Response time: {response_time:.1f}s")
                     
-                    # Speak response
-                    self.speak_edge(response)
+                    # Finish speaking the remaining sentences
+                    if self.edge_available:
+                        self.speech_pipeline.finish()
                     
                     # Auto-save settings
                     self.save_settings()
+                    self.enrichment.touch()
                 
             except KeyboardInterrupt:
                 print("\n👋 AI System shutting down...")
+                self.enrichment.shutdown()
+                self.model_lifecycle.release()
+                self.save_knowledge_base()
                 break
             except Exception as e:
                 print(f"System error: {e}")
@@ -5,10 +5,11 @@ except ImportError:
 import ollama
 import time
 import json
-import os
 import asyncio
-import pygame
+import io
 from datetime import datetime
+from audio_engine import get_playback_engine
+from model_registry import get_model_registry
 try:
     import edge_tts
 except ImportError:
@@ -39,6 +40,7 @@ class AIWithEdgeTTS:
         try:
             # Test Edge TTS
             self.voice = "en-US-AriaNeural"  # High quality female voice
+            self.audio_engine = get_playback_engine()
             print(f"🔊 Edge neural TTS ready - Voice: {self.voice}")
             self.edge_available = True
             
@@ -66,34 +68,19 @@ class AIWithEdgeTTS:
         """Generate speech with Edge TTS"""
         communicate = edge_tts.Communicate(text, self.voice)
         
-        # Save to file
-        temp_file = "temp_speech.mp3"
-        await communicate.save(temp_file)
+        # Stream the audio into memory instead of a temp file
+        audio = io.BytesIO()
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                audio.write(chunk["data"])
+        audio.seek(0)
         
-        # Play audio
-        pygame.mixer.init()
-        pygame.mixer.music.load(temp_file)
-        pygame.mixer.music.play()
-        
-        # Wait for playback
-        while pygame.mixer.music.get_busy():
-            await asyncio.sleep(0.1)
-        
-        # Cleanup
-        pygame.mixer.quit()
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
+        # Play on the shared engine and wait for playback
+        await asyncio.to_thread(self.audio_engine.play, audio)
     
     def get_model(self):
         """Get working AI model"""
-        models = ['phi3:mini', 'gemma:2b', 'llama2:latest']
-        for model in models:
-            try:
-                ollama.generate(model=model, prompt='test', options={'num_predict': 1})
-                return model
-            except:
-                continue
-        return 'phi3:mini'
+        return get_model_registry().choose('phi3:mini')
     
     def search_web(self, query):
         """Search web for information"""
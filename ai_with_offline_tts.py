@@ -7,6 +7,7 @@ import time
 import json
 import os
 from datetime import datetime
+from model_registry import get_model_registry
 
 # Offline TTS
 import pyttsx3
@@ -82,14 +83,7 @@ class AIWithOfflineTTS:
     
     def get_model(self):
         """Get working AI model"""
-        models = ['phi3:mini', 'gemma:2b', 'llama2:latest']
-        for model in models:
-            try:
-                ollama.generate(model=model, prompt='test', options={'num_predict': 1})
-                return model
-            except:
-                continue
-        return 'phi3:mini'
+        return get_model_registry().choose('phi3:mini')
     
     def load_knowledge(self):
         """Load AI knowledge base"""
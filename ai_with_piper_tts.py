@@ -6,13 +6,14 @@ import ollama
 import time
 import json
 import os
-import wave
-import pygame
 from datetime import datetime
 try:
     from piper import PiperVoice
 except ImportError:
     PiperVoice = None
+from speech_pipeline import SpeechPipeline
+from audio_engine import get_playback_engine
+from model_registry import get_model_registry
 
 class AIWithPiperTTS:
     def __init__(self):
@@ -40,6 +41,9 @@ class AIWithPiperTTS:
         try:
             if os.path.exists(self.model_path):
                 self.voice = PiperVoice.load(self.model_path)
+                self.sample_rate = getattr(getattr(self.voice, 'config', None), 'sample_rate', 22050)
+                self.audio_engine = get_playback_engine()
+                self.speech_pipeline = SpeechPipeline(self._synthesize_sentence, self._play_pcm)
                 print("🔊 Piper neural TTS ready with Amy voice")
                 self.piper_available = True
             else:
@@ -57,49 +61,46 @@ class AIWithPiperTTS:
         
         try:
             print("🗣️ Speaking with neural voice...")
-            
-            # Generate audio data
-            audio_data = b''
-            for audio_chunk in self.voice.synthesize(text):
-                audio_data += audio_chunk
-            
-            # Save to temporary WAV file
-            temp_wav = "temp_speech.wav"
-            with wave.open(temp_wav, 'wb') as wav_file:
-                wav_file.setnchannels(1)
-                wav_file.setsampwidth(2)
-                wav_file.setframerate(22050)
-                wav_file.writeframes(audio_data)
-            
-            # Play the audio
-            pygame.mixer.init(frequency=22050)
-            pygame.mixer.music.load(temp_wav)
-            pygame.mixer.music.play()
-            
-            # Wait for playback to finish
-            while pygame.mixer.music.get_busy():
-                time.sleep(0.1)
-            
-            # Cleanup
-            pygame.mixer.quit()
-            if os.path.exists(temp_wav):
-                os.remove(temp_wav)
-            
+            self.speech_pipeline.speak(text)
             print("✅ Neural speech completed")
             
         except Exception as e:
             print(f"Piper speech error: {e}")
     
+    def _synthesize_sentence(self, sentence):
+        """Synthesize one sentence, yielding PCM blocks as Piper produces them"""
+        # The first chunk is played right away; later ones are batched into
+        # blocks of about a second so playback is not a stream of tiny clips
+        block_bytes = self.sample_rate * 2
+        pending = []
+        pending_bytes = 0
+        first = True
+        
+        for audio_chunk in self.voice.synthesize(sentence):
+            # piper-tts >= 1.3 yields AudioChunk objects instead of raw bytes
+            audio_chunk = getattr(audio_chunk, 'audio_int16_bytes', audio_chunk)
+            if first:
+                first = False
+                yield audio_chunk
+                continue
+            
+            pending.append(audio_chunk)
+            pending_bytes += len(audio_chunk)
+            if pending_bytes >= block_bytes:
+                yield b''.join(pending)
+                pending = []
+                pending_bytes = 0
+        
+        if pending:
+            yield b''.join(pending)
+    
+    def _play_pcm(self, audio_data):
+        """Play synthesized PCM straight from memory"""
+        self.audio_engine.play_pcm(audio_data, self.sample_rate)
+    
     def get_model(self):
         """Get working AI model"""
-        models = ['phi3:mini', 'gemma:2b', 'llama2:latest']
-        for model in models:
-            try:
-                ollama.generate(model=model, prompt='test', options={'num_predict': 1})
-                return model
-            except:
-                continue
-        return 'phi3:mini'
+        return get_model_registry().choose('phi3:mini')
     
     def search_web(self, query):
         """Search web for information"""
@@ -121,8 +122,8 @@ class AIWithPiperTTS:
             print(f"Search error: {e}")
             return []
     
-    def generate_response(self, user_input, search_results=None):
-        """Generate AI response"""
+    def generate_response_stream(self, user_input, search_results=None):
+        """Generate AI response token by token"""
         try:
             context = f"Current time: {datetime.now().strftime('%A, %B %d, %Y at %I:%M %p')}\n"
             
@@ -140,20 +141,33 @@ class AIWithPiperTTS:
             
             prompt = f"{context}User: {user_input}\nAI:"
             
-            response = ollama.generate(
+            stream = ollama.generate(
                 model=self.model,
                 prompt=prompt,
                 options={
                     'num_predict': 150,
                     'temperature': 0.7,
                     'top_p': 0.9
-                }
+                },
+                stream=True
             )
             
-            return response['response'].strip()
+            started = False
+            for part in stream:
+                token = part['response']
+                if not started:
+                    token = token.lstrip()
+                if not token:
+                    continue
+                started = True
+                yield token
             
         except Exception as e:
-            return f"I encountered an error: {str(e)}"
+            yield f"I encountered an error: {str(e)}"
+    
+    def generate_response(self, user_input, search_results=None):
+        """Generate AI response"""
+        return ''.join(self.generate_response_stream(user_input, search_results)).strip()
     
     def run(self):
         """Main AI system loop"""
@@ -191,8 +205,16 @@ class AIWithPiperTTS:
                     if needs_search:
                         search_results = self.search_web(user_input)
                     
-                    # Generate response
-                    response = self.generate_response(user_input, search_results)
+                    # Generate response, speaking each sentence as it completes
+                    chunks = []
+                    print("AI: ", end="", flush=True)
+                    for token in self.generate_response_stream(user_input, search_results):
+                        chunks.append(token)
+                        print(token, end="", flush=True)
+                        if self.piper_available:
+                            self.speech_pipeline.feed(token)
+                    print()
+                    response = ''.join(chunks).strip()
                     
                     # Add to conversation history
                     self.conversation_history.append(f"AI: {response}")
@@ -201,14 +223,14 @@ class AIWithPiperTTS:
                     if len(self.conversation_history) > 10:
                         self.conversation_history = self.conversation_history[-10:]
                     
-                    # Show response
+                    # Show response time
                     response_time = time.time() - start_time
                     timestamp = datetime.now().strftime("%H:%M:%S")
                     print(f"[{timestamp}] Response time: {response_time:.1f}s")
-                    print(f"AI: {response}")
                     
-                    # Speak with neural voice
-                    self.speak_piper(response)
+                    # Finish speaking with neural voice
+                    if self.piper_available:
+                        self.speech_pipeline.finish()
                 
             except KeyboardInterrupt:
                 print("\n👋 AI System shutting down...")
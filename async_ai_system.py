@@ -0,0 +1,358 @@
+import asyncio
+import os
+import time
+import ollama
+from datetime import datetime
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+from http_client import http_get, create_async_session
+from ai_system import (
+    DefaultAISystem,
+    WELCOME_MESSAGE,
+    GOODBYE_MESSAGE,
+    FEED_SUCCESS_PREFIX,
+    FEED_FAILED_MESSAGE,
+    RESET_MESSAGE,
+    SEARCH_DEADLINES,
+)
+from speech_pipeline import SentenceSplitter
+
+class AsyncAISystem(DefaultAISystem):
+    """DefaultAISystem running end-to-end on one persistent asyncio event loop
+
+    Generation goes through ollama.AsyncClient, the HTTP search providers use
+    aiohttp (or a worker thread when it is not installed) and speech is
+    synthesized and played by background tasks on the same loop, so searching
+    and generating the next turn overlap with speaking the previous one.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.client = ollama.AsyncClient()
+        self.http = None
+        self.splitter = SentenceSplitter()
+        self.sentence_queue = None
+        self.audio_queue = None
+
+    def create_speech_pipeline(self):
+        """Speech runs as tasks on the event loop instead of worker threads"""
+        return None
+
+    async def fetch(self, url, as_json=False, timeout=10, retries=2):
+        """GET a URL without blocking the event loop"""
+        if aiohttp is None:
+            response = await asyncio.to_thread(http_get, url, timeout=timeout)
+            return response.json() if as_json else response.content
+
+        if self.http is None:
+            self.http = create_async_session()
+        for attempt in range(retries + 1):
+            try:
+                async with self.http.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    if response.status in (429, 500, 502, 503, 504) and attempt < retries:
+                        raise aiohttp.ClientResponseError(response.request_info, (), status=response.status)
+                    if as_json:
+                        return await response.json(content_type=None)
+                    return await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == retries:
+                    raise
+                # Exponential backoff between retries
+                await asyncio.sleep(0.3 * (2 ** attempt))
+
+    async def search_github(self, query):
+        """Search GitHub repositories"""
+        cached = self.search_cache.get('github', query)
+        if cached is not None:
+            return cached
+        try:
+            url = f"https://api.github.com/search/repositories?q={query}&sort=stars&order=desc"
+            results = self.parse_github_results(await self.fetch(url, as_json=True))
+        except:
+            results = []
+        if results:
+            self.search_cache.put('github', query, results)
+        return results
+
+    async def search_arxiv(self, query):
+        """Search arXiv papers"""
+        cached = self.search_cache.get('arxiv', query)
+        if cached is not None:
+            return cached
+        try:
+            url = f"http://export.arxiv.org/api/query?search_query=all:{query}&start=0&max_results=3"
+            results = self.parse_arxiv_results(await self.fetch(url))
+        except:
+            results = []
+        if results:
+            self.search_cache.put('arxiv', query, results)
+        return results
+
+    async def search_wikipedia(self, query):
+        """Search Wikipedia"""
+        cached = self.search_cache.get('wikipedia', query)
+        if cached is not None:
+            return cached
+        try:
+            url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{query}"
+            results = self.parse_wikipedia_result(await self.fetch(url, as_json=True))
+        except:
+            results = []
+        if results:
+            self.search_cache.put('wikipedia', query, results)
+        return results
+
+    async def auto_search(self, user_input):
+        """Search every applicable source concurrently, each within its deadline"""
+        user_lower = user_input.lower()
+
+        # DDGS has no async API, so the web search runs in a worker thread
+        searches = [('web', asyncio.to_thread(self.search_web, user_input))]
+        if any(word in user_lower for word in ['what', 'who', 'when', 'where', 'how']):
+            searches.append(('wikipedia', self.search_wikipedia(user_input)))
+        if any(word in user_lower for word in ['code', 'programming', 'software', 'library', 'framework']):
+            searches.append(('github', self.search_github(user_input)))
+        if any(word in user_lower for word in ['research', 'study', 'algorithm', 'theory', 'analysis']):
+            searches.append(('arxiv', self.search_arxiv(user_input)))
+
+        async def within_deadline(name, search):
+            try:
+                return await asyncio.wait_for(search, SEARCH_DEADLINES[name])
+            except asyncio.TimeoutError:
+                print(f"⏱️ {name} search timed out")
+            except Exception:
+                pass
+            return []
+
+        found = await asyncio.gather(*(within_deadline(name, search) for name, search in searches))
+        results = dict(zip([name for name, _ in searches], found))
+
+        all_results = list(results.get('web', [])) + list(results.get('wikipedia', []))
+        all_results.extend([{'title': f"GitHub: {r['name']}", 'content': f"{r['description']} - {r['url']}"} for r in results.get('github', [])])
+        all_results.extend([{'title': f"Research: {r['title']}", 'content': r['summary']} for r in results.get('arxiv', [])])
+        return all_results[:5]  # Limit to top 5 results
+
+    async def feed_data(self, data_input, data_type="text"):
+        """Feed data to AI for learning"""
+        try:
+            print(f"🍽️ Feeding {data_type} data to AI...")
+
+            # Chunking and storing reads from disk/network, so keep it off the loop
+            first_id, chunk_count, key_topics = await asyncio.to_thread(self.ingest, data_input, data_type)
+
+            if not chunk_count:
+                print("❌ No content extracted")
+                return False
+
+            self.enrichment.submit(first_id, key_topics)
+            self.report_feed(chunk_count, key_topics)
+            return True
+
+        except Exception as e:
+            print(f"Data feeding error: {e}")
+            return False
+
+    async def generate_response_stream(self, user_input, search_results=None):
+        """Generate AI response token by token as the model produces it"""
+        try:
+            # Retrieval and the model lookup block on SQLite and HTTP, so run them off the loop
+            request, reply = await asyncio.to_thread(self.prepare_chat, user_input, search_results)
+            stream = await self.client.chat(**request)
+            self.model_lifecycle.touch()
+
+            async for part in stream:
+                text = self.reply_text(reply, part)
+                if text:
+                    yield text
+
+            rest = await asyncio.to_thread(self.finish_reply, reply)
+            if rest:
+                yield rest
+
+        except Exception as e:
+            if self.settings.get("auto_reset", False):
+                await asyncio.to_thread(self.auto_heal, "model_error")
+            yield f"I encountered an error: {str(e)}"
+
+    async def generate_response(self, user_input, search_results=None):
+        """Generate AI response with adaptive length"""
+        return ''.join([token async for token in self.generate_response_stream(user_input, search_results)]).strip()
+
+    def start_speech(self):
+        """Start the speech tasks on the running event loop"""
+        self.sentence_queue = asyncio.Queue()
+        self.audio_queue = asyncio.Queue()
+        asyncio.create_task(self._synthesis_worker())
+        asyncio.create_task(self._playback_worker())
+
+    def feed_speech(self, token):
+        """Queue every sentence a streamed token completes"""
+        if self.edge_available:
+            for sentence in self.splitter.feed(token):
+                self.sentence_queue.put_nowait(sentence)
+
+    def finish_speech(self):
+        """Queue the trailing sentence without waiting for playback"""
+        rest = self.splitter.flush()
+        if rest and self.edge_available:
+            self.sentence_queue.put_nowait(rest)
+
+    async def speak(self, text, wait=False):
+        """Speak text; by default return immediately and let it play in the background"""
+        self.feed_speech(self._clean_speech_text(text) + ' ')
+        self.finish_speech()
+        if wait:
+            await self.sentence_queue.join()
+            await self.audio_queue.join()
+
+    async def _synthesis_worker(self):
+        while True:
+            sentence = await self.sentence_queue.get()
+            try:
+                audio = await self._generate_speech(sentence)
+                if audio is not None:
+                    await self.audio_queue.put(audio)
+            except Exception as e:
+                print(f"Speech synthesis error: {e}")
+            finally:
+                self.sentence_queue.task_done()
+
+    async def _playback_worker(self):
+        while True:
+            audio = await self.audio_queue.get()
+            try:
+                await asyncio.to_thread(self._play_speech_audio, audio)
+            except Exception as e:
+                print(f"Speech playback error: {e}")
+            finally:
+                self.audio_queue.task_done()
+
+    async def handle_turn(self, user_input):
+        """Search, generate and start speaking one chat turn"""
+        start_time = time.time()
+        self.enrichment.touch()
+
+        search_results = []
+        if self.should_search(user_input):
+            print("🤖 AI decided to search for information...")
+            search_results = await self.auto_search(user_input)
+            if not search_results:
+                print("📚 Working offline - using AI knowledge")
+
+        first_token_time = None
+        print("AI: ", end="", flush=True)
+        async for token in self.generate_response_stream(user_input, search_results):
+            if first_token_time is None:
+                first_token_time = time.time() - start_time
+            print(token, end="", flush=True)
+            self.feed_speech(token)
+        print()
+        self.finish_speech()
+
+        response_time = time.time() - start_time
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        print(f"[{timestamp}] First token: {first_token_time or 0:.1f}s, Response time: {response_time:.1f}s")
+
+        await asyncio.to_thread(self.save_settings)
+        self.enrichment.touch()
+
+    async def main(self):
+        """Main AI system loop on a single event loop"""
+        self.start_speech()
+
+        print("\n" + "="*60)
+        print(f"🤖 ΛI-NEXUS - REVOLUTIONARY AI SYSTEM (async)")
+        print("Features: Self-Healing, Neural Voice, AI Auto-Search, Data Feeding, OCR")
+        print("="*60)
+
+        print(f"\nAI: {WELCOME_MESSAGE}")
+        await self.speak(WELCOME_MESSAGE)
+
+        try:
+            while True:
+                try:
+                    # input() blocks, so read it in a thread while speech keeps playing
+                    user_input = (await asyncio.to_thread(input, "\nYou: ")).strip()
+
+                    if user_input.lower() in ['exit', 'quit', 'bye']:
+                        print(f"AI: {GOODBYE_MESSAGE}")
+                        await self.speak(GOODBYE_MESSAGE, wait=True)
+                        break
+
+                    elif user_input.lower().startswith('feed '):
+                        data = user_input[5:].strip()
+                        if data.startswith('http'):
+                            success = await self.feed_data(data, "url")
+                        elif os.path.exists(data):
+                            image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']
+                            if any(data.lower().endswith(ext) for ext in image_extensions):
+                                success = await self.feed_data(data, "image")
+                            else:
+                                success = await self.feed_data(data, "file")
+                        else:
+                            success = await self.feed_data(data, "text")
+
+                        if success:
+                            feed_msg = f"{FEED_SUCCESS_PREFIX} My knowledge base now has {self.knowledge_store.count()} entries."
+                        else:
+                            feed_msg = FEED_FAILED_MESSAGE
+                        print(f"AI: {feed_msg}")
+                        await self.speak(feed_msg)
+
+                    elif user_input.lower().startswith('bulk '):
+                        # Bulk feeding runs its own worker pool; keep it off the loop
+                        stats = await asyncio.to_thread(self.bulk_feed, user_input[5:].strip())
+                        bulk_msg = self.bulk_feed_message(stats)
+                        print(f"AI: {bulk_msg}")
+                        await self.speak(bulk_msg)
+
+                    elif user_input.lower() == 'knowledge':
+                        stats = f"Knowledge Base Stats: {self.knowledge_store.count()} entries, Learning score: {self.learning_score}, Top concepts: {self.knowledge_store.top_concepts(3)}"
+                        print(f"AI: {stats}")
+                        await self.speak(stats)
+
+                    elif user_input.lower() == 'cache':
+                        print(f"AI: {self.cache_stats_message()}")
+
+                    elif user_input.lower() == 'reset':
+                        await asyncio.to_thread(self.reset_to_defaults)
+                        print(f"AI: {RESET_MESSAGE}")
+                        await self.speak(RESET_MESSAGE)
+
+                    elif user_input.lower() in ['cleanup', 'clean', 'optimize']:
+                        cleanup_msg = await asyncio.to_thread(self.smart_cleanup)
+                        print(f"AI: {cleanup_msg}")
+                        await self.speak(cleanup_msg)
+
+                    elif user_input:
+                        await self.handle_turn(user_input)
+
+                except (KeyboardInterrupt, EOFError):
+                    print("\n👋 AI System shutting down...")
+                    break
+                except Exception as e:
+                    print(f"System error: {e}")
+                    if self.settings.get("auto_reset", False):
+                        await asyncio.to_thread(self.auto_heal, "critical_error")
+                        error_msg = f"I've automatically healed from a critical error. System status: {self.health_status}"
+                        print(f"AI: {error_msg}")
+                        await self.speak(error_msg)
+        finally:
+            self.enrichment.shutdown()
+            self.model_lifecycle.release()
+            self.save_knowledge_base()
+            if self.http is not None:
+                await self.http.close()
+
+    def run(self):
+        """Run the main loop on one persistent event loop"""
+        try:
+            asyncio.run(self.main())
+        except KeyboardInterrupt:
+            print("\n👋 AI System shutting down...")
+
+if __name__ == "__main__":
+    ai = AsyncAISystem()
+    ai.run()
@@ -0,0 +1,138 @@
+import io
+import queue
+import threading
+import wave
+
+try:
+    import pygame
+except ImportError:
+    try:
+        import pygame_ce as pygame
+    except ImportError:
+        pygame = None
+
+
+class PlaybackEngine:
+    """Long-lived audio output shared by every TTS backend
+
+    The mixer is opened once and kept open, so utterances never pay for
+    re-initializing the audio device; get_playback_engine() hands every
+    backend the same instance. Audio is queued and played in order on one
+    channel by a worker thread; each item finishes after its known duration
+    and then fires its completion callback, so nothing polls the mixer
+    between sentences.
+    """
+
+    def __init__(self, frequency=22050, size=-16, channels=2, buffer=512):
+        self.available = False
+        self.audio_queue = queue.Queue()
+        self.stopped = threading.Event()
+
+        if pygame is None:
+            print("❌ pygame not installed - audio playback disabled")
+            return
+
+        try:
+            pygame.mixer.init(frequency=frequency, size=size, channels=channels, buffer=buffer)
+            self.channel = pygame.mixer.Channel(0)
+            self.available = True
+        except Exception as e:
+            print(f"❌ Audio device error: {e}")
+            return
+
+        threading.Thread(target=self._worker, daemon=True).start()
+
+    def enqueue(self, source, on_done=None):
+        """Queue encoded audio (file path or in-memory buffer) and return immediately"""
+        if not self.available:
+            raise RuntimeError("Audio device not available")
+        self.audio_queue.put((pygame.mixer.Sound(source), on_done))
+
+    def enqueue_pcm(self, pcm, sample_rate, channels=1, on_done=None):
+        """Queue raw 16-bit PCM and return immediately"""
+        if not self.available:
+            raise RuntimeError("Audio device not available")
+        mixer_rate, _, mixer_channels = pygame.mixer.get_init()
+        if (sample_rate, channels) == (mixer_rate, mixer_channels):
+            sound = pygame.mixer.Sound(buffer=pcm)
+        else:
+            # Let the mixer convert rate/channels from an in-memory WAV header
+            sound = pygame.mixer.Sound(pcm_to_wav(pcm, sample_rate, channels))
+        self.audio_queue.put((sound, on_done))
+
+    def play(self, source):
+        """Queue encoded audio and block until it has finished playing"""
+        done = threading.Event()
+        self.enqueue(source, lambda: done.set())
+        done.wait()
+
+    def play_pcm(self, pcm, sample_rate, channels=1):
+        """Queue raw 16-bit PCM and block until it has finished playing"""
+        done = threading.Event()
+        self.enqueue_pcm(pcm, sample_rate, channels, lambda: done.set())
+        done.wait()
+
+    def wait(self):
+        """Block until everything queued so far has been played"""
+        self.audio_queue.join()
+
+    def shutdown(self):
+        """Stop playback and release the audio device"""
+        if not self.available:
+            return
+        self.stopped.set()
+        self.available = False
+        try:
+            self.channel.stop()
+            pygame.mixer.quit()
+        except Exception:
+            pass
+
+        # Release anyone still waiting on audio that will never play
+        while True:
+            try:
+                _, on_done = self.audio_queue.get_nowait()
+            except queue.Empty:
+                break
+            if on_done:
+                on_done()
+            self.audio_queue.task_done()
+
+    def _worker(self):
+        while not self.stopped.is_set():
+            sound, on_done = self.audio_queue.get()
+            try:
+                self.channel.play(sound)
+                # Sleep for the clip's duration instead of polling get_busy()
+                self.stopped.wait(sound.get_length())
+            except Exception as e:
+                print(f"Audio playback error: {e}")
+            finally:
+                if on_done:
+                    on_done()
+                self.audio_queue.task_done()
+
+
+def pcm_to_wav(pcm, sample_rate, channels=1):
+    """Wrap raw 16-bit PCM in an in-memory WAV file"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    buffer.seek(0)
+    return buffer
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_playback_engine():
+    """Return the process-wide playback engine, opening the device on first use"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = PlaybackEngine()
+        return _engine
@@ -0,0 +1,201 @@
+import argparse
+import glob
+import io
+import os
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from http_client import http_get
+from ingestion import chunk_text, iter_document_text, iter_url_text
+from knowledge_store import KnowledgeStore
+from topics import analyze_text
+
+TEXT_EXTENSIONS = (
+    '.txt', '.md', '.rst', '.log', '.csv', '.json', '.xml', '.yaml', '.yml',
+    '.html', '.htm', '.xhtml', '.py', '.ini', '.cfg'
+)
+
+
+def is_url(location):
+    return location.startswith(('http://', 'https://'))
+
+
+def _local_name(element):
+    return element.tag.rsplit('}', 1)[-1]
+
+
+def iter_sitemap(location):
+    """Yield page URLs from a sitemap, following nested sitemap indexes"""
+    data = io.BytesIO(http_get(location, timeout=15).content) if is_url(location) else location
+    nested = []
+    for _, element in ET.iterparse(data):
+        tag = _local_name(element)
+        if tag in ('url', 'sitemap'):
+            loc = next((child.text.strip() for child in element if _local_name(child) == 'loc' and child.text), None)
+            if loc and tag == 'url':
+                yield loc
+            elif loc:
+                nested.append(loc)
+            element.clear()
+    for loc in nested:
+        yield from iter_sitemap(loc)
+
+
+def iter_sources(target):
+    """Yield (kind, location) pairs for a directory, glob, sitemap, URL list file or single URL"""
+    if target.lower().endswith('.xml') or (is_url(target) and 'sitemap' in target.lower()):
+        for url in iter_sitemap(target):
+            yield 'url', url
+    elif is_url(target):
+        yield 'url', target
+    elif os.path.isdir(target):
+        for root, _, files in os.walk(target):
+            for name in sorted(files):
+                if name.lower().endswith(TEXT_EXTENSIONS):
+                    yield 'file', os.path.join(root, name)
+    elif any(char in target for char in '*?['):
+        for path in glob.iglob(target, recursive=True):
+            if os.path.isfile(path):
+                yield 'file', path
+    elif os.path.isfile(target):
+        # A list file: one URL or path per line, '#' starts a comment
+        with open(target, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield ('url' if is_url(line) else 'file'), line
+    else:
+        raise FileNotFoundError(f"Nothing to feed at {target}")
+
+
+# Corpus statistics for TF-IDF topics, set once per worker process
+_worker_frequencies = (None, 0)
+
+
+def _init_worker(frequencies, document_count):
+    global _worker_frequencies
+    _worker_frequencies = (frequencies, document_count)
+
+
+def extract_document(kind, location, frequencies=None, document_count=0):
+    """Fetch, chunk and analyze one document; returns its entries without ids"""
+    if frequencies is None:
+        frequencies, document_count = _worker_frequencies
+    pieces = iter_url_text(location) if kind == 'url' else iter_document_text(location)
+    entries = []
+    for index, chunk in enumerate(chunk_text(pieces)):
+        entries.append({
+            'timestamp': datetime.now().isoformat(),
+            'content': chunk,
+            'analysis': analyze_text(chunk, frequencies, document_count),
+            'related_searches': [],
+            'reinforcement_score': 1.0,
+            'usage_count': 0,
+            'source': location,
+            'chunk': index
+        })
+    return entries
+
+
+class BulkFeeder:
+    """Feed many documents into the knowledge store with a bounded worker pool
+
+    Documents are fetched and analyzed in parallel, with at most two per worker
+    in flight so a huge source list never piles up in memory. Finished entries
+    are written in batches, one transaction per batch, and progress is printed
+    after every batch. With processes=True the workers are processes, so topic
+    extraction on large documents is not serialized by the GIL.
+    """
+
+    def __init__(self, store, workers=8, batch_size=200, on_batch=None, processes=False, tfidf=False):
+        self.store = store
+        self.workers = workers
+        self.batch_size = batch_size
+        self.on_batch = on_batch
+        self.processes = processes
+        self.tfidf = tfidf
+
+    def run(self, target):
+        stats = {'documents': 0, 'chunks': 0, 'failed': 0, 'seconds': 0.0}
+        start = time.time()
+        batch = []
+        pending = {}
+
+        def collect(done):
+            for future in done:
+                kind, location = pending.pop(future)
+                try:
+                    entries = future.result()
+                except Exception as e:
+                    stats['failed'] += 1
+                    print(f"❌ {location}: {e}")
+                    continue
+                if entries:
+                    stats['documents'] += 1
+                    batch.extend(entries)
+                if len(batch) >= self.batch_size:
+                    self._commit(batch, stats, start)
+
+        # TF-IDF ranks against a snapshot of the corpus taken before the run
+        frequencies, document_count = self.store.document_frequencies() if self.tfidf else (None, 0)
+        if self.processes:
+            # Ship the snapshot to each process once instead of with every document
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(frequencies, document_count))
+            corpus = ()
+        else:
+            pool = ThreadPoolExecutor(max_workers=self.workers)
+            corpus = (frequencies, document_count)
+
+        print(f"🍽️ Bulk feeding {target} with {self.workers} {'processes' if self.processes else 'workers'}...")
+        with pool:
+            for kind, location in iter_sources(target):
+                if len(pending) >= self.workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending[pool.submit(extract_document, kind, location, *corpus)] = (kind, location)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        if batch:
+            self._commit(batch, stats, start)
+        stats['seconds'] = time.time() - start
+        print(f"✅ Bulk feed done: {stats['documents']} documents, {stats['chunks']} entries, "
+              f"{stats['failed']} failed in {stats['seconds']:.1f}s")
+        return stats
+
+    def _commit(self, batch, stats, start):
+        entries = list(batch)
+        batch.clear()
+        for entry, entry_id in zip(entries, self.store.add_entries(entries)):
+            entry['id'] = entry_id
+        stats['chunks'] += len(entries)
+        if self.on_batch:
+            self.on_batch(entries)
+
+        elapsed = max(time.time() - start, 1e-6)
+        print(f"📦 {stats['documents']} documents, {stats['chunks']} entries "
+              f"({stats['documents'] / elapsed:.1f} docs/s, {stats['chunks'] / elapsed:.0f} entries/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk feed documents into the AI knowledge base")
+    parser.add_argument('target', help="directory, glob pattern, sitemap (URL or .xml) or a file listing URLs/paths")
+    parser.add_argument('--workers', type=int, default=8, help="parallel fetch/analyze workers")
+    parser.add_argument('--batch', type=int, default=200, help="entries per database transaction")
+    parser.add_argument('--processes', action='store_true', help="use worker processes instead of threads")
+    parser.add_argument('--tfidf', action='store_true', help="rank topics by TF-IDF against the existing knowledge base")
+    args = parser.parse_args()
+
+    store = KnowledgeStore()
+    try:
+        feeder = BulkFeeder(store, workers=args.workers, batch_size=args.batch, processes=args.processes, tfidf=args.tfidf)
+        feeder.run(args.target)
+        print(f"Knowledge base now has {store.count()} entries")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
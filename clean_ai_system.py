@@ -9,6 +9,8 @@ import os
 import asyncio
 import pygame
 from datetime import datetime
+from knowledge_store import KnowledgeStore
+from model_registry import get_model_registry
 try:
     import edge_tts
 except ImportError:
@@ -33,9 +35,7 @@ class CleanAISystem:
     def load_knowledge_base(self):
         """Load AI knowledge base"""
         try:
-            if os.path.exists('ai_knowledge_base.json'):
-                with open('ai_knowledge_base.json', 'r') as f:
-                    return json.load(f)
+            return KnowledgeStore().load()
         except:
             pass
         
@@ -120,19 +120,9 @@ class CleanAISystem:
     
     def get_model(self):
         """Get working AI model with fallback"""
-        try:
-            model = self.settings["ai_model"]
-            ollama.generate(model=model, prompt='test', options={'num_predict': 1})
-            return model
-        except:
-            for model in ['phi3:mini', 'gemma:2b', 'llama2:latest']:
-                try:
-                    ollama.generate(model=model, prompt='test', options={'num_predict': 1})
-                    self.settings["ai_model"] = model
-                    return model
-                except:
-                    continue
-            return 'phi3:mini'
+        model = get_model_registry().choose(self.settings["ai_model"])
+        self.settings["ai_model"] = model
+        return model
     
     def generate_response(self, user_input, search_results=None):
         """Generate AI response"""
@@ -0,0 +1,248 @@
+import argparse
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import time
+import zlib
+from array import array
+from datetime import datetime, timedelta
+try:
+    import numpy as np
+except ImportError:
+    np = None
+from knowledge_store import KnowledgeStore
+from vector_index import retain_vectors
+
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+BANDS = 16  # 16 bands of 4 rows: pairs above ~0.6 Jaccard almost always share a band
+HASH_PRIME = 4294967291  # Largest prime below 2**32
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def content_hash(content):
+    """Hash of content ignoring case and whitespace differences"""
+    return hashlib.sha1(' '.join(content.lower().split()).encode('utf-8')).digest()
+
+
+class MinHasher:
+    """MinHash signatures over word shingles for near-duplicate detection"""
+
+    def __init__(self, num_permutations=NUM_PERMUTATIONS, shingle_size=SHINGLE_SIZE, seed=1):
+        rng = random.Random(seed)
+        self.shingle_size = shingle_size
+        # 31-bit coefficients keep a * hash + b below 2**64 for the numpy path
+        self.a = [rng.randrange(1, 1 << 31) for _ in range(num_permutations)]
+        self.b = [rng.randrange(0, 1 << 31) for _ in range(num_permutations)]
+        if np is not None:
+            self.np_a = np.array(self.a, dtype=np.uint64)
+            self.np_b = np.array(self.b, dtype=np.uint64)
+
+    def shingles(self, content):
+        words = WORD_PATTERN.findall(content.lower())
+        if len(words) < self.shingle_size:
+            return {zlib.crc32(' '.join(words).encode('utf-8'))}
+        return {
+            zlib.crc32(' '.join(words[i:i + self.shingle_size]).encode('utf-8'))
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+
+    def signature(self, content):
+        """Return the signature as an array of 32-bit minimums"""
+        hashes = self.shingles(content)
+        if np is not None:
+            values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+            mins = ((np.outer(self.np_a, values) + self.np_b[:, None]) % np.uint64(HASH_PRIME)).min(axis=1)
+            return array('I', mins.astype(np.uint32).tobytes())
+        return array('I', [min((a * h + b) % HASH_PRIME for h in hashes) for a, b in zip(self.a, self.b)])
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(first, second)) / len(first)
+
+
+class _Groups:
+    """Union-find over entry ids; the root is the entry that is kept"""
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, entry_id):
+        parent = self.parent.get(entry_id, entry_id)
+        if parent == entry_id:
+            return entry_id
+        root = self.find(parent)
+        self.parent[entry_id] = root
+        return root
+
+    def union(self, keep, duplicate):
+        keep, duplicate = self.find(keep), self.find(duplicate)
+        if keep != duplicate:
+            # Keep the oldest entry so its id stays valid for the vector index
+            keep, duplicate = min(keep, duplicate), max(keep, duplicate)
+            self.parent[duplicate] = keep
+
+
+def find_duplicates(store, near=True, threshold=0.85):
+    """Return {duplicate_id: kept_id} for exact and near-duplicate entries"""
+    groups = _Groups()
+    seen_hashes = {}
+    hasher = MinHasher() if near else None
+    buckets = {}
+    signatures = {}
+    rows_per_band = NUM_PERMUTATIONS // BANDS
+
+    for entry in store.iter_entries():
+        entry_id, content = entry['id'], entry.get('content', '')
+        digest = content_hash(content)
+        if digest in seen_hashes:
+            groups.union(seen_hashes[digest], entry_id)
+            continue
+        seen_hashes[digest] = entry_id
+
+        if hasher is None:
+            continue
+        signature = hasher.signature(content)
+        signatures[entry_id] = signature
+        # LSH: only entries that share a whole band are compared
+        for band in range(BANDS):
+            key = (band, signature[band * rows_per_band:(band + 1) * rows_per_band].tobytes())
+            for other_id in buckets.get(key, ()):
+                if groups.find(other_id) != groups.find(entry_id) and similarity(signature, signatures[other_id]) >= threshold:
+                    groups.union(other_id, entry_id)
+            buckets.setdefault(key, []).append(entry_id)
+
+    return {entry_id: groups.find(entry_id) for entry_id in groups.parent if groups.find(entry_id) != entry_id}
+
+
+def is_stale(entry, cutoff):
+    """True for an entry that was never retrieved and was fed before cutoff"""
+    if entry['usage_count'] > 0:
+        return False
+    try:
+        return datetime.fromisoformat(entry['timestamp']) < cutoff
+    except (TypeError, ValueError):
+        return False
+
+
+def compact(path='ai_knowledge_base.db', near=True, threshold=0.85, min_score=None, unused_days=None, vectors='knowledge_vectors', dry_run=False):
+    """Deduplicate and prune the knowledge base, then swap in the rewritten file
+
+    Duplicates fold into the oldest copy: usage counts add up and the
+    reinforcement each copy earned above the 1.0 baseline is added to the
+    kept entry's score. Nothing is pruned by default. Scores start at 1.0
+    and only rise, so min_score has to be above 1.0 to drop entries that
+    were never reinforced; unused_days drops entries that were never
+    retrieved and are older than that many days. The result is written to
+    a new database that replaces the old one with os.replace, so a crash
+    leaves either the old or the new base. The id sequence carries over, so
+    removed ids are never handed out again, and their rows are dropped from
+    the embedding index at the vectors path. Run it while the assistant is
+    stopped.
+    """
+    start = time.time()
+    store = KnowledgeStore(path, legacy_json=None)
+    before = store.count()
+    duplicates = find_duplicates(store, near=near, threshold=threshold)
+
+    # Fold each duplicate's usage into the entry that is kept
+    merged = {}
+    for entry in store.iter_entries():
+        kept_id = duplicates.get(entry['id'])
+        if kept_id is not None:
+            usage, gain = merged.get(kept_id, (0, 0.0))
+            merged[kept_id] = (usage + entry['usage_count'], gain + max(entry['reinforcement_score'] - 1.0, 0.0))
+
+    print(f"🔍 {len(duplicates)} duplicate entries out of {before}")
+    if dry_run:
+        store.close()
+        return {'before': before, 'duplicates': len(duplicates), 'pruned': 0, 'after': before - len(duplicates)}
+
+    new_path = f"{path}.compact"
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(new_path + suffix):
+            os.remove(new_path + suffix)
+    compacted = KnowledgeStore(new_path, legacy_json=None)
+
+    cutoff = datetime.now() - timedelta(days=unused_days) if unused_days is not None else None
+    pruned = 0
+    kept_ids = set()
+    batch = []
+    for entry in store.iter_entries():
+        if entry['id'] in duplicates:
+            continue
+        usage, gain = merged.get(entry['id'], (0, 0.0))
+        entry['usage_count'] += usage
+        entry['reinforcement_score'] += gain
+        if (min_score is not None and entry['reinforcement_score'] < min_score) or (cutoff is not None and is_stale(entry, cutoff)):
+            pruned += 1
+            continue
+        batch.append(entry)
+        kept_ids.add(entry['id'])
+        if len(batch) >= 500:
+            compacted.add_entries(batch)
+            batch = []
+    if batch:
+        compacted.add_entries(batch)
+
+    # Carry over the tables that are not derived from the entries
+    with store.lock, compacted.lock, compacted.db:
+        for key, score in store.db.execute('SELECT key, score FROM reinforcement_scores'):
+            compacted.db.execute('INSERT OR REPLACE INTO reinforcement_scores (key, score) VALUES (?, ?)', (key, score))
+        for entry_id, topics in store.db.execute('SELECT entry_id, topics FROM enrichment_queue'):
+            kept_id = duplicates.get(entry_id, entry_id)
+            if kept_id in kept_ids:
+                compacted.db.execute('INSERT OR IGNORE INTO enrichment_queue (entry_id, topics) VALUES (?, ?)', (kept_id, topics))
+        for key, value in store.db.execute("SELECT key, value FROM meta WHERE key IN ('migrated', 'last_update')"):
+            compacted.db.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+        # Continue the old id sequence: removed ids may still be named in the vector files
+        row = store.db.execute("SELECT seq FROM sqlite_sequence WHERE name = 'entries'").fetchone()
+        sequence = max(row[0] if row else 0, store.db.execute('SELECT COALESCE(MAX(id), 0) FROM entries').fetchone()[0])
+        if not compacted.db.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'entries'", (sequence,)).rowcount:
+            compacted.db.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('entries', ?)", (sequence,))
+    after = compacted.count()
+
+    # Fold the WAL into the main file so the single .db file is complete
+    compacted.db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    compacted.close()
+    store.db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    store.close()
+
+    os.replace(new_path, path)
+    for suffix in ('-wal', '-shm'):
+        for stale in (path + suffix, new_path + suffix):
+            if os.path.exists(stale):
+                os.remove(stale)
+    if vectors:
+        dropped = retain_vectors(kept_ids, vectors)
+        if dropped:
+            print(f"🧭 Dropped {dropped} embeddings of removed entries")
+
+    stats = {'before': before, 'duplicates': len(duplicates), 'pruned': pruned, 'after': after}
+    print(f"✅ Compacted {before} → {after} entries ({len(duplicates)} duplicates merged, {pruned} pruned) in {time.time() - start:.1f}s")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deduplicate and prune the AI knowledge base")
+    parser.add_argument('--db', default='ai_knowledge_base.db', help="knowledge base file")
+    parser.add_argument('--exact-only', action='store_true', help="only merge entries with identical content")
+    parser.add_argument('--threshold', type=float, default=0.85, help="MinHash similarity for near duplicates")
+    parser.add_argument('--min-score', type=float, default=None, help="drop entries with a lower reinforcement score (scores start at 1.0)")
+    parser.add_argument('--unused-days', type=float, default=None, help="drop entries never retrieved and older than this many days")
+    parser.add_argument('--vectors', default='knowledge_vectors', help="embedding index files to drop removed entries from")
+    parser.add_argument('--dry-run', action='store_true', help="report duplicates without rewriting")
+    args = parser.parse_args()
+
+    try:
+        compact(args.db, near=not args.exact_only, threshold=args.threshold, min_score=args.min_score,
+                unused_days=args.unused_days, vectors=args.vectors, dry_run=args.dry_run)
+    except sqlite3.Error as e:
+        print(f"❌ Compaction failed, the knowledge base is unchanged: {e}")
+
+
+if __name__ == "__main__":
+    main()
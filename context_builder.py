@@ -0,0 +1,89 @@
+import re
+from knowledge_index import tokenize
+
+CHARS_PER_TOKEN = 4  # Close to what llama-family tokenizers average on English text
+SENTENCE_END = re.compile(r"[.!?](?=\s)")
+
+
+def estimate_tokens(text):
+    """Approximate token count of text without loading a tokenizer"""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def messages_tokens(messages):
+    """Approximate token count of chat messages, with a few tokens of framing each"""
+    return sum(estimate_tokens(message['content']) + 4 for message in messages)
+
+
+def truncate_to_tokens(text, tokens):
+    """Cut text to about tokens, at a sentence end or else a word boundary"""
+    limit = tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    sentence_ends = [match.end() for match in SENTENCE_END.finditer(cut + ' ')]
+    if sentence_ends and sentence_ends[-1] > limit // 2:
+        return cut[:sentence_ends[-1]]
+    return cut.rsplit(' ', 1)[0] + '...'
+
+
+def _shingles(text, size=3):
+    words = tokenize(text)
+    if len(words) < size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class ContextBuilder:
+    """Packs the most relevant context pieces into a token budget
+
+    Candidates are scored by how many query terms they contain plus a small
+    prior for their rank within their own source, so the best search result
+    or knowledge entry wins ties. They are then taken best first while they
+    fit. A piece that mostly repeats one already taken (search providers often
+    return the same paragraph) is skipped, and the first piece that does not
+    fit whole is cut down to the remaining budget instead of being dropped.
+    """
+
+    def __init__(self, query, budget, max_piece_tokens=200, min_piece_tokens=32, overlap=0.6):
+        self.query_terms = set(tokenize(query))
+        self.budget = budget
+        self.max_piece_tokens = max_piece_tokens
+        self.min_piece_tokens = min_piece_tokens
+        self.overlap = overlap
+        self.candidates = []
+
+    def add(self, section, text, rank=0, title=''):
+        """Add a candidate piece; rank is its position in its source's own ranking"""
+        text = ' '.join(text.split())
+        if not text:
+            return
+        terms = set(tokenize(f"{title} {text}"))
+        matched = len(self.query_terms & terms) / len(self.query_terms) if self.query_terms else 0.0
+        score = matched + 0.5 / (rank + 1)
+        self.candidates.append({'section': section, 'title': title, 'text': text, 'score': score, 'order': len(self.candidates)})
+
+    def build(self):
+        """Return the chosen pieces grouped by section, each section in source order"""
+        remaining = self.budget
+        chosen = []
+        taken_shingles = []
+        for candidate in sorted(self.candidates, key=lambda c: c['score'], reverse=True):
+            if remaining < self.min_piece_tokens:
+                break
+            shingles = _shingles(candidate['text'])
+            if shingles and any(len(shingles & other) / min(len(shingles), len(other)) >= self.overlap for other in taken_shingles if other):
+                continue
+
+            framing = estimate_tokens(candidate['title']) + 4
+            if remaining - framing < self.min_piece_tokens:
+                continue
+            text = truncate_to_tokens(candidate['text'], min(self.max_piece_tokens, remaining - framing))
+            remaining -= estimate_tokens(text) + framing
+            taken_shingles.append(shingles)
+            chosen.append(dict(candidate, text=text))
+
+        sections = {}
+        for piece in sorted(chosen, key=lambda c: c['order']):
+            sections.setdefault(piece['section'], []).append(piece)
+        return sections
@@ -0,0 +1,50 @@
+SYSTEM_PROMPT = "You are Lambda I-NEXUS. When search results are provided, ALWAYS use them to answer the question with current information. Do not mention knowledge limitations."
+
+
+class Conversation:
+    """Chat messages for one session, ordered so the prompt prefix stays stable
+
+    The system message never changes and past turns are kept as plain
+    question/answer pairs. Anything that changes per turn (the time, fed
+    knowledge, search results) goes into the last user message only, and
+    is not kept in the history. The server's cached prefix therefore covers
+    the system message and the history up to the previous turn; that turn's
+    question was sent with its context prepended, so evaluation restarts
+    there and only the previous turn and the new message are evaluated.
+    History is trimmed in halves, not one turn at a time, so the prefix
+    shifts only every few turns instead of on every one.
+    """
+
+    def __init__(self, system_prompt=SYSTEM_PROMPT, max_turns=4):
+        self.system = {'role': 'system', 'content': system_prompt}
+        self.max_turns = max_turns
+        self.turns = []
+
+    def messages(self, user_input, context=''):
+        """Return the chat messages for a new user turn"""
+        messages = [self.system]
+        for question, answer in self.turns:
+            messages.append({'role': 'user', 'content': question})
+            messages.append({'role': 'assistant', 'content': answer})
+        content = f"{context}\n{user_input}" if context else user_input
+        messages.append({'role': 'user', 'content': content})
+        return messages
+
+    def record(self, user_input, response):
+        """Add a finished turn; the per-turn context is not kept"""
+        self.turns.append((user_input, response))
+        if len(self.turns) > self.max_turns:
+            self.turns = self.turns[-(self.max_turns // 2 or 1):]
+
+    def drop_oldest(self):
+        """Forget the oldest turn; returns False if there was none"""
+        if not self.turns:
+            return False
+        self.turns.pop(0)
+        return True
+
+    def clear(self):
+        self.turns = []
+
+    def __len__(self):
+        return len(self.turns)
@@ -6,8 +6,11 @@ import ollama
 import time
 import json
 import os
+import threading
 from datetime import datetime
 import pyttsx3
+from speech_pipeline import SpeechPipeline
+from model_registry import get_model_registry
 
 class CustomizableAI:
     def __init__(self):
@@ -75,45 +78,55 @@ class CustomizableAI:
             print("🔇 Speech disabled in settings")
             return
         
-        try:
-            self.tts = pyttsx3.init()
-            
-            # Apply speech settings
-            self.tts.setProperty('rate', self.settings["speech_rate"])
-            self.tts.setProperty('volume', self.settings["speech_volume"])
-            
-            # Set voice
-            voices = self.tts.getProperty('voices')
-            if voices and len(voices) > self.settings["voice_index"]:
-                self.tts.setProperty('voice', voices[self.settings["voice_index"]].id)
-                print(f"🔊 Voice: {voices[self.settings['voice_index']].name}")
-            
-            self.tts_available = True
-            print(f"🔊 TTS ready - Rate: {self.settings['speech_rate']}, Volume: {self.settings['speech_volume']}")
-            
-        except Exception as e:
-            print(f"TTS setup error: {e}")
+        # pyttsx3 drivers (SAPI5 COM, macOS run loop) only work on the thread that
+        # created the engine, so the playback worker creates and owns it
+        self.tts = None
+        ready = threading.Event()
+        
+        def create_engine():
+            try:
+                self.tts = self._create_tts_engine()
+            finally:
+                ready.set()
+        
+        # pyttsx3 synthesizes and plays in one call, so it only needs the playback stage
+        self.speech_pipeline = SpeechPipeline(None, self._say_sentence, init_playback=create_engine)
+        ready.wait(timeout=10)
+        if self.tts is None:
+            print("TTS setup error: speech engine did not start")
+            return
+        
+        self.tts_available = True
+        print(f"🔊 TTS ready - Rate: {self.settings['speech_rate']}, Volume: {self.settings['speech_volume']}")
+    
+    def _create_tts_engine(self):
+        """Create the pyttsx3 engine; runs on the speech pipeline's playback worker"""
+        tts = pyttsx3.init()
+        
+        # Apply speech settings
+        tts.setProperty('rate', self.settings["speech_rate"])
+        tts.setProperty('volume', self.settings["speech_volume"])
+        
+        # Set voice
+        voices = tts.getProperty('voices')
+        if voices and len(voices) > self.settings["voice_index"]:
+            tts.setProperty('voice', voices[self.settings["voice_index"]].id)
+            print(f"🔊 Voice: {voices[self.settings['voice_index']].name}")
+        return tts
     
     def setup_ai(self):
         """Setup AI based on settings"""
         self.model = self.settings["ai_model"]
         self.conversation_history = []
         
-        # Test model
-        try:
-            ollama.generate(model=self.model, prompt='test', options={'num_predict': 1})
+        # Check the model against the installed list instead of generating with it
+        model = get_model_registry().choose(self.model)
+        if model == self.model:
             print(f"🧠 AI Model: {self.model}")
-        except:
-            print(f"⚠️ Model {self.model} not available, trying alternatives...")
-            for alt_model in ['phi3:mini', 'gemma:2b', 'llama2:latest']:
-                try:
-                    ollama.generate(model=alt_model, prompt='test', options={'num_predict': 1})
-                    self.model = alt_model
-                    self.settings["ai_model"] = alt_model
-                    print(f"🧠 Using alternative model: {alt_model}")
-                    break
-                except:
-                    continue
+        else:
+            print(f"⚠️ Model {self.model} not available, using alternative model: {model}")
+            self.model = model
+            self.settings["ai_model"] = model
     
     def speak(self, text):
         """Speak text based on settings"""
@@ -122,12 +135,16 @@ class CustomizableAI:
         
         try:
             print("🗣️ Speaking...")
-            self.tts.say(text)
-            self.tts.runAndWait()
+            self.speech_pipeline.speak(text)
             print("✅ Speech done")
         except Exception as e:
             print(f"Speech error: {e}")
     
+    def _say_sentence(self, sentence):
+        """Speak one sentence on the speech pipeline's playback worker"""
+        self.tts.say(sentence)
+        self.tts.runAndWait()
+    
     def search_web(self, query):
         """Search web based on settings"""
         if not self.settings["search_enabled"]:
@@ -154,8 +171,8 @@ class CustomizableAI:
             print(f"Search error: {e}")
             return []
     
-    def generate_response(self, user_input, search_results=None):
-        """Generate AI response based on settings"""
+    def generate_response_stream(self, user_input, search_results=None):
+        """Generate AI response token by token based on settings"""
         try:
             # Build context with personality
             context = f"I am {self.settings['ai_name']}, an AI assistant who is {self.settings['personality']}.\n"
@@ -177,20 +194,33 @@ class CustomizableAI:
             
             prompt = f"{context}User: {user_input}\nAI:"
             
-            response = ollama.generate(
+            stream = ollama.generate(
                 model=self.model,
                 prompt=prompt,
                 options={
                     'num_predict': self.settings["response_length"],
                     'temperature': self.settings["temperature"],
                     'top_p': 0.9
-                }
+                },
+                stream=True
             )
             
-            return response['response'].strip()
+            started = False
+            for part in stream:
+                token = part['response']
+                if not started:
+                    token = token.lstrip()
+                if not token:
+                    continue
+                started = True
+                yield token
             
         except Exception as e:
-            return f"I encountered an error: {str(e)}"
+            yield f"I encountered an error: {str(e)}"
+    
+    def generate_response(self, user_input, search_results=None):
+        """Generate AI response based on settings"""
+        return ''.join(self.generate_response_stream(user_input, search_results)).strip()
     
     def show_settings(self):
         """Display current settings"""
@@ -337,9 +367,17 @@ class CustomizableAI:
                     if needs_search:
                         search_results = self.search_web(user_input)
                     
-                    # Generate response
+                    # Generate response, speaking each sentence as it completes
                     start_time = time.time()
-                    response = self.generate_response(user_input, search_results)
+                    chunks = []
+                    print("\nAI: ", end="", flush=True)
+                    for token in self.generate_response_stream(user_input, search_results):
+                        chunks.append(token)
+                        print(token, end="", flush=True)
+                        if self.tts_available:
+                            self.speech_pipeline.feed(token)
+                    print()
+                    response = ''.join(chunks).strip()
                     response_time = time.time() - start_time
                     
                     # Add to conversation history
@@ -351,13 +389,13 @@ class CustomizableAI:
                         if len(self.conversation_history) > memory_limit:
                             self.conversation_history = self.conversation_history[-memory_limit:]
                     
-                    # Show response
+                    # Show response time
                     timestamp = datetime.now().strftime("%H:%M:%S")
-                    print(f"\n[{timestamp}] Response time: {response_time:.1f}s")
-                    print(f"AI: {response}")
+                    print(f"[{timestamp}] Response time: {response_time:.1f}s")
                     
-                    # Speak if enabled
-                    self.speak(response)
+                    # Finish speaking if enabled
+                    if self.tts_available:
+                        self.speech_pipeline.finish()
                 
             except KeyboardInterrupt:
                 print("\n👋 Goodbye!")
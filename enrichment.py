@@ -0,0 +1,100 @@
+import logging
+import queue
+import threading
+import time
+
+# The worker runs while the REPL waits for input, so errors go to a logger
+# (silent unless the front end configures logging) instead of the prompt
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class EnrichmentQueue:
+    """Background related-topic searches for fed entries
+
+    Feeding stores an entry right away and queues its topics here. A single
+    worker searches them while the user is idle, at most one search every
+    min_interval seconds, retrying failed or empty searches with exponential
+    backoff, and then writes the results onto the entry. Queued jobs are kept
+    in the knowledge store, so jobs left over at exit run on the next start.
+    """
+
+    def __init__(self, store, search, on_done=None, min_interval=2.0, idle_delay=5.0, retries=3, retry_delay=5.0):
+        self.store = store
+        self.search = search
+        self.on_done = on_done
+        self.min_interval = min_interval
+        self.idle_delay = idle_delay
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.jobs = queue.Queue()
+        self.stopped = threading.Event()
+        self.quiet_until = 0.0
+        self.last_search = 0.0
+
+        for entry_id, topics in store.pending_enrichments():
+            self.jobs.put((entry_id, topics))
+
+        self.thread = threading.Thread(target=self._worker, name='enrichment', daemon=True)
+        self.thread.start()
+
+    def submit(self, entry_id, topics):
+        """Queue related searches for a stored entry"""
+        self.store.queue_enrichment(entry_id, topics)
+        self.jobs.put((entry_id, topics))
+
+    def touch(self):
+        """Note user activity; searches wait until idle_delay seconds of quiet"""
+        self.quiet_until = time.time() + self.idle_delay
+
+    def pending(self):
+        return self.jobs.qsize()
+
+    def shutdown(self):
+        self.stopped.set()
+        self.thread.join(timeout=2)
+
+    def _worker(self):
+        while not self.stopped.is_set():
+            try:
+                entry_id, topics = self.jobs.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            related_info = []
+            for topic in topics[:2]:  # Search top 2 topics
+                search_results = self._search(topic)
+                if self.stopped.is_set():
+                    return  # Job stays queued in the store for the next start
+                if search_results:
+                    related_info.extend(search_results[:1])  # Take 1 result per topic
+
+            try:
+                self.store.finish_enrichment(entry_id, related_info)
+                if self.on_done:
+                    self.on_done(entry_id, related_info)
+            except Exception as e:
+                logger.warning("Enrichment save error: %s", e)
+
+    def _search(self, topic):
+        for attempt in range(self.retries):
+            # Wait for a quiet moment and for the rate limit
+            while not self.stopped.is_set():
+                delay = max(self.quiet_until, self.last_search + self.min_interval) - time.time()
+                if delay <= 0:
+                    break
+                self.stopped.wait(delay)
+            if self.stopped.is_set():
+                return []
+
+            self.last_search = time.time()
+            try:
+                search_results = self.search(topic)
+                if search_results:
+                    return search_results
+            except Exception as e:
+                logger.warning("Enrichment search error: %s", e)
+
+            if attempt + 1 < self.retries:
+                self.stopped.wait(self.retry_delay * 2 ** attempt)
+        return []
@@ -20,7 +20,7 @@ def feed_url_to_ai():
         
         if success:
             print("SUCCESS: URL data extracted and saved!")
-            print(f"Knowledge base now has {len(ai.knowledge_base['fed_data'])} entries")
+            print(f"Knowledge base now has {ai.knowledge_store.count()} entries")
         else:
             print("FAILED: Could not extract data from URL")
             
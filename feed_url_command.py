@@ -23,14 +23,14 @@ def main():
     url = "https://en.wikipedia.org/wiki/Article_(grammar)"
     
     try:
-        import requests
+        from http_client import http_get
         from bs4 import BeautifulSoup
-        import json
         from datetime import datetime
+        from knowledge_store import KnowledgeStore
         
         print(f"Testing URL extraction: {url}")
         
-        response = requests.get(url, timeout=10)
+        response = http_get(url, timeout=10)
         soup = BeautifulSoup(response.content, 'html.parser')
         
         # Remove scripts and styles
@@ -44,12 +44,7 @@ def main():
         print(f"Preview: {clean_text[:200]}...")
         
         # Save to knowledge base
-        kb_file = 'ai_knowledge_base.json'
-        try:
-            with open(kb_file, 'r') as f:
-                kb = json.load(f)
-        except:
-            kb = {'fed_data': [], 'learned_concepts': {}}
+        store = KnowledgeStore()
         
         entry = {
             'timestamp': datetime.now().isoformat(),
@@ -60,13 +55,10 @@ def main():
             'usage_count': 0
         }
         
-        kb['fed_data'].append(entry)
-        
-        with open(kb_file, 'w') as f:
-            json.dump(kb, f, indent=2)
+        store.add_entry(entry)
         
         print(f"✅ URL data saved to knowledge base!")
-        print(f"Total entries: {len(kb['fed_data'])}")
+        print(f"Total entries: {store.count()}")
         
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -1,11 +1,8 @@
-import json
-import os
 import ollama
-from datetime import datetime
+from knowledge_store import KnowledgeStore
 
 # Load knowledge base
-with open('ai_knowledge_base.json', 'r') as f:
-    kb = json.load(f)
+kb = KnowledgeStore().load()
 
 print("Knowledge Base Test:")
 print(f"Total entries: {len(kb['fed_data'])}")
@@ -0,0 +1,62 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+DEFAULT_TIMEOUT = 10
+MAX_CONNECTIONS_PER_HOST = 8
+DEFAULT_HEADERS = {
+    'User-Agent': 'LambdaI-NEXUS/1.0',
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the shared keep-alive session used by every outbound provider
+
+    Connections are pooled per host, so repeated calls to the same API skip
+    DNS, TCP and TLS setup. Idempotent requests are retried with exponential
+    backoff on connection errors, 429 and 5xx responses.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=['GET', 'HEAD'],
+                respect_retry_after_header=True,
+            )
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=MAX_CONNECTIONS_PER_HOST, max_retries=retry)
+            session = requests.Session()
+            session.headers.update(DEFAULT_HEADERS)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+def http_get(url, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """GET through the shared session with a default timeout"""
+    return get_session().get(url, timeout=timeout, **kwargs)
+
+
+def create_async_session():
+    """Create a pooled aiohttp session; it must be created and closed on the running loop"""
+    if aiohttp is None:
+        return None
+    connector = aiohttp.TCPConnector(limit=64, limit_per_host=MAX_CONNECTIONS_PER_HOST, ttl_dns_cache=300)
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=DEFAULT_HEADERS,
+        timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
+        auto_decompress=True,
+    )
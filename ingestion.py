@@ -0,0 +1,135 @@
+import codecs
+import re
+from html.parser import HTMLParser
+from http_client import http_get
+
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+READ_BLOCK_SIZE = 64 * 1024
+WHITESPACE = re.compile(r'\s+')
+HTML_EXTENSIONS = ('.html', '.htm', '.xhtml')
+
+
+class _TextExtractor(HTMLParser):
+    """Incremental HTML-to-text parser that drops script and style content"""
+
+    SKIP_TAGS = {'script', 'style', 'noscript', 'template'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.skip_depth = 0
+        self.text = []
+        self.text_size = 0
+        self.pieces = []
+
+    def handle_starttag(self, tag, attrs):
+        self._end_text()
+        if tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+
+    def handle_endtag(self, tag):
+        self._end_text()
+        if tag in self.SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def handle_data(self, data):
+        # A text node can arrive split across feed() calls; join it at the next tag
+        if not self.skip_depth:
+            self.text.append(data)
+            self.text_size += len(data)
+            if self.text_size > READ_BLOCK_SIZE:
+                # Very long text node (e.g. a plain-text page): pass it on without waiting
+                self.pieces.append(''.join(self.text))
+                self.text = []
+                self.text_size = 0
+
+    def close(self):
+        super().close()
+        self._end_text()
+
+    def take(self):
+        pieces, self.pieces = self.pieces, []
+        return pieces
+
+    def _end_text(self):
+        text = ' '.join(''.join(self.text).split())
+        self.text = []
+        self.text_size = 0
+        if text:
+            self.pieces.append(text + ' ')
+
+
+def iter_html_text(blocks):
+    """Yield the visible text of HTML arriving as a stream of str blocks"""
+    parser = _TextExtractor()
+    for block in blocks:
+        parser.feed(block)
+        yield from parser.take()
+    parser.close()
+    yield from parser.take()
+
+
+def iter_url_text(url, block_size=16 * 1024):
+    """Yield the visible text of a web page while it downloads"""
+    response = http_get(url, timeout=10, stream=True)
+    try:
+        # requests assumes ISO-8859-1 for text/* without a charset; most pages are UTF-8
+        encoding = response.encoding if 'charset' in response.headers.get('Content-Type', '') else 'utf-8'
+        decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+
+        def blocks():
+            for block in response.iter_content(block_size):
+                yield decoder.decode(block)
+            yield decoder.decode(b'', final=True)
+
+        yield from iter_html_text(blocks())
+    finally:
+        response.close()
+
+
+def iter_file_text(file_path, block_size=READ_BLOCK_SIZE):
+    """Yield a text file in fixed-size blocks"""
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            yield block
+
+
+def iter_document_text(file_path):
+    """Yield the text of a local file, stripping markup from HTML files"""
+    if file_path.lower().endswith(HTML_EXTENSIONS):
+        return iter_html_text(iter_file_text(file_path))
+    return iter_file_text(file_path)
+
+
+def chunk_text(pieces, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
+    """Split streamed text into overlapping chunks of about chunk_size characters
+
+    Pieces are concatenated as-is, so a word split across two file blocks is
+    rejoined. Chunks break at whitespace where possible, and each one repeats
+    the last overlap characters of the previous chunk so facts spanning a
+    boundary stay retrievable. Only the current window is held in memory.
+    """
+    buffer = ''
+    emitted = 0  # Length of the buffer prefix that the last chunk already covered
+    for piece in pieces:
+        # The carried prefix is already normalized, so this never changes its length
+        buffer = WHITESPACE.sub(' ', buffer + piece)
+
+        while len(buffer) >= chunk_size:
+            cut = buffer.rfind(' ', overlap + 1, chunk_size)
+            if cut == -1:
+                cut = chunk_size
+            yield buffer[:cut].strip()
+
+            # Start the next chunk at a word boundary inside the overlap
+            start = buffer.find(' ', cut - overlap, cut)
+            start = start + 1 if start != -1 else cut
+            buffer = buffer[start:]
+            emitted = cut - start
+
+    # Only emit the tail if it has text the last chunk did not include
+    if buffer[emitted:].strip():
+        yield buffer.strip()
@@ -0,0 +1,71 @@
+import heapq
+import math
+import re
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Words that never identify a topic, including the question words users type
+STOP_WORDS = {
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did',
+    'will', 'would', 'could', 'should', 'what', 'who', 'when', 'where', 'why', 'how',
+    'which', 'tell', 'about', 'this', 'that', 'from', 'me', 'you', 'your', 'can', 'it'
+}
+
+
+def tokenize(text):
+    """Lowercase word tokens without punctuation or stop words"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+class KnowledgeIndex:
+    """BM25 retrieval over the knowledge store's inverted index
+
+    Content tokens and analysis key_topics map to entry ids in the store, so a
+    query only reads the postings of its own terms. Scores are BM25 over the
+    entry content plus a boost for key-topic matches, weighted by each entry's
+    reinforcement_score.
+    """
+
+    def __init__(self, store, k1=1.2, b=0.75, topic_boost=2.0):
+        self.store = store
+        self.k1 = k1
+        self.b = b
+        self.topic_boost = topic_boost
+
+    def search(self, query, limit=2):
+        """Return up to limit entry records ranked by BM25 x reinforcement_score"""
+        return [entry for entry, _ in self.search_scored(query, limit)]
+
+    def search_scored(self, query, limit=2):
+        """Return (entry record, score) pairs, best first"""
+        doc_count = self.store.doc_count
+        if not doc_count:
+            return []
+        average_length = self.store.total_length / doc_count or 1
+
+        scores = {}
+        weights = {}
+        for token in set(tokenize(query)):
+            df = self.store.posting_count(token)
+            # Terms in most entries carry almost no signal; skipping them keeps big bases fast
+            if df and (doc_count < 100 or df <= doc_count / 2):
+                idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+                for entry_id, tf, length, weight in self.store.postings(token):
+                    norm = self.k1 * (1 - self.b + self.b * (length or 0) / average_length)
+                    scores[entry_id] = scores.get(entry_id, 0) + idf * tf * (self.k1 + 1) / (tf + norm)
+                    weights[entry_id] = weight
+            for entry_id, weight in self.store.topic_postings(token):
+                scores[entry_id] = scores.get(entry_id, 0) + self.topic_boost
+                weights[entry_id] = weight
+
+        # Records already in memory may carry score changes not yet written back
+        records = self.store.records
+        ranked = []
+        for entry_id, score in scores.items():
+            # .get: the record LRU may evict between a membership test and a lookup
+            record = records.get(entry_id)
+            weight = record.reinforcement_score if record is not None else weights[entry_id]
+            ranked.append((entry_id, score * max(weight, 0.1)))
+        top = heapq.nlargest(limit, ranked, key=lambda pair: pair[1])
+        return [(self.store.record(entry_id), score) for entry_id, score in top]
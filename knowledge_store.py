@@ -0,0 +1,473 @@
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime
+from knowledge_index import tokenize
+
+# Entry fields stored in their own columns; anything else goes into 'extra'
+ENTRY_COLUMNS = ['timestamp', 'content', 'analysis', 'related_searches', 'reinforcement_score', 'usage_count']
+
+# Entry bodies kept in memory after being paged in
+BODY_CACHE_SIZE = 256
+# EntryRecords kept in memory; each is a few hundred bytes
+RECORD_CACHE_SIZE = 2048
+MMAP_SIZE = 256 * 1024 * 1024
+
+
+class EntryRecord:
+    """Compact in-memory view of an entry: ids, topics and scores only
+
+    Other fields ('content', 'analysis', ...) are read from the store the
+    first time they are indexed, so records stay small without keeping
+    their text in memory.
+    """
+
+    __slots__ = ('id', 'key_topics', 'reinforcement_score', 'usage_count', 'length', 'store')
+
+    HOT_FIELDS = ('id', 'key_topics', 'reinforcement_score', 'usage_count', 'length')
+
+    def __init__(self, store, entry_id, key_topics, reinforcement_score, usage_count, length):
+        self.store = store
+        self.id = entry_id
+        self.key_topics = key_topics
+        self.reinforcement_score = reinforcement_score
+        self.usage_count = usage_count
+        self.length = length
+
+    def __getitem__(self, key):
+        if key in self.HOT_FIELDS:
+            return getattr(self, key)
+        return self.store.get_entry(self.id)[key]
+
+    def __setitem__(self, key, value):
+        if key not in self.HOT_FIELDS:
+            raise KeyError(f"{key} is not a record field")
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except (KeyError, TypeError):
+            return default
+
+
+class KnowledgeStore:
+    """SQLite-backed storage for the AI knowledge base
+
+    Each fed entry is one row, so feeding costs a single insert instead of
+    rewriting the whole base. The database runs in WAL mode so readers never
+    block the writer. An existing ai_knowledge_base.json is imported once on
+    first use.
+
+    Nothing but corpus totals is read at startup. The BM25 postings live in
+    the database (memory-mapped), entries are handed out as EntryRecords, and
+    entry bodies are paged in on demand through a small LRU cache.
+    """
+
+    def __init__(self, path='ai_knowledge_base.db', legacy_json='ai_knowledge_base.json'):
+        self.path = path
+        self.lock = threading.RLock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute(f'PRAGMA mmap_size={MMAP_SIZE}')
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT,
+                content TEXT,
+                analysis TEXT,
+                related_searches TEXT,
+                reinforcement_score REAL DEFAULT 1.0,
+                usage_count INTEGER DEFAULT 0,
+                extra TEXT
+            );
+            CREATE TABLE IF NOT EXISTS learned_concepts (
+                topic TEXT PRIMARY KEY,
+                count INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS reinforcement_scores (
+                key TEXT PRIMARY KEY,
+                score REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                entry_id INTEGER NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, entry_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS topic_postings (
+                term TEXT NOT NULL,
+                entry_id INTEGER NOT NULL,
+                PRIMARY KEY (term, entry_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS enrichment_queue (
+                entry_id INTEGER PRIMARY KEY,
+                topics TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            -- Document frequencies now come from the postings
+            DROP TABLE IF EXISTS term_frequencies;
+        ''')
+        if 'length' not in [row[1] for row in self.db.execute('PRAGMA table_info(entries)')]:
+            self.db.execute('ALTER TABLE entries ADD COLUMN length INTEGER DEFAULT 0')
+        self.db.commit()
+
+        self.records = OrderedDict()
+        self.bodies = OrderedDict()
+
+        if legacy_json and self.get_meta('migrated') is None:
+            self.import_json(legacy_json)
+        if self.get_meta('postings') is None:
+            self.rebuild_postings()
+
+        # Corpus totals for BM25 are kept in meta so startup never scans the entries
+        self.doc_count = int(self.get_meta('doc_count') or 0)
+        self.total_length = int(self.get_meta('total_length') or 0)
+
+    def get_meta(self, key):
+        with self.lock:
+            row = self.db.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.db.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def import_json(self, json_path):
+        """One-time import of the legacy JSON knowledge base"""
+        knowledge_base = {}
+        try:
+            if os.path.exists(json_path):
+                with open(json_path, 'r') as f:
+                    knowledge_base = json.load(f)
+        except Exception as e:
+            print(f"Knowledge import error: {e}")
+            return
+
+        with self.lock, self.db:
+            for entry in knowledge_base.get('fed_data', []):
+                self._insert_entry(entry)
+            for topic, count in knowledge_base.get('learned_concepts', {}).items():
+                self.db.execute(
+                    'INSERT INTO learned_concepts (topic, count) VALUES (?, ?) '
+                    'ON CONFLICT(topic) DO UPDATE SET count = count + excluded.count',
+                    (topic, count)
+                )
+            for key, score in knowledge_base.get('reinforcement_scores', {}).items():
+                self.db.execute('INSERT OR REPLACE INTO reinforcement_scores (key, score) VALUES (?, ?)', (key, score))
+            self._set_meta('migrated', datetime.now().isoformat())
+
+        if knowledge_base.get('fed_data'):
+            print(f"📦 Imported {len(knowledge_base['fed_data'])} entries from {json_path}")
+
+    def load(self):
+        """Load the knowledge base in the dict layout the AI systems use"""
+        with self.lock:
+            rows = self.db.execute(
+                'SELECT id, timestamp, content, analysis, related_searches, reinforcement_score, usage_count, extra '
+                'FROM entries ORDER BY id'
+            ).fetchall()
+            concepts = self.db.execute('SELECT topic, count FROM learned_concepts').fetchall()
+            scores = self.db.execute('SELECT key, score FROM reinforcement_scores').fetchall()
+
+        return {
+            'fed_data': [self._row_to_entry(row) for row in rows],
+            'learned_concepts': dict(concepts),
+            'reinforcement_scores': dict(scores),
+            'last_update': self.get_meta('last_update') or datetime.now().isoformat()
+        }
+
+    def add_entry(self, entry):
+        """Insert one entry and count its topics; returns the new entry id"""
+        return self.add_entries([entry])[0]
+
+    def add_entries(self, entries):
+        """Insert entries in a single transaction; returns their ids in order"""
+        with self.lock, self.db:
+            entry_ids = []
+            for entry in entries:
+                entry_id = self._insert_entry(entry)
+                entry_ids.append(entry_id)
+                self.total_length += self._index_entry(entry_id, entry.get('content', ''), entry.get('analysis', {}))
+                self.doc_count += 1
+                for topic in entry.get('analysis', {}).get('key_topics', []):
+                    self.db.execute(
+                        'INSERT INTO learned_concepts (topic, count) VALUES (?, 1) '
+                        'ON CONFLICT(topic) DO UPDATE SET count = count + 1',
+                        (topic,)
+                    )
+            self._set_corpus_totals()
+            self._set_meta('last_update', datetime.now().isoformat())
+        return entry_ids
+
+    def add_score_deltas(self, deltas):
+        """Apply {entry_id: (usage_delta, score_delta)} as increments in one transaction"""
+        rows = [(usage, score, entry_id) for entry_id, (usage, score) in deltas.items()]
+        with self.lock, self.db:
+            self.db.executemany(
+                'UPDATE entries SET usage_count = usage_count + ?, reinforcement_score = reinforcement_score + ? WHERE id = ?',
+                rows
+            )
+
+    def queue_enrichment(self, entry_id, topics):
+        """Remember that an entry still needs related searches"""
+        with self.lock, self.db:
+            self.db.execute('INSERT OR REPLACE INTO enrichment_queue (entry_id, topics) VALUES (?, ?)', (entry_id, json.dumps(topics)))
+
+    def pending_enrichments(self):
+        """Return [(entry_id, topics)] queued for related searches, oldest first"""
+        with self.lock:
+            rows = self.db.execute('SELECT entry_id, topics FROM enrichment_queue ORDER BY entry_id').fetchall()
+        return [(entry_id, json.loads(topics)) for entry_id, topics in rows]
+
+    def finish_enrichment(self, entry_id, related_searches):
+        """Store an entry's related search results and dequeue it"""
+        with self.lock, self.db:
+            if related_searches:
+                self.db.execute('UPDATE entries SET related_searches = ? WHERE id = ?', (json.dumps(related_searches), entry_id))
+                self.bodies.pop(entry_id, None)
+            self.db.execute('DELETE FROM enrichment_queue WHERE entry_id = ?', (entry_id,))
+
+    def record(self, entry_id):
+        """Return the EntryRecord for an id, or None if there is no such entry
+
+        Recently used records are cached in an LRU, so score changes made on
+        one stay visible until the ScoreWriter writes them back; entries with
+        pending changes were used within the last flush interval and stay at
+        the recent end.
+        """
+        with self.lock:
+            record = self.records.get(entry_id)
+            if record is not None:
+                self.records.move_to_end(entry_id)
+            else:
+                row = self.db.execute(
+                    'SELECT analysis, reinforcement_score, usage_count, length FROM entries WHERE id = ?', (entry_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                analysis, score, usage_count, length = row
+                key_topics = json.loads(analysis).get('key_topics', []) if analysis else []
+                record = EntryRecord(self, entry_id, key_topics, score, usage_count, length or 0)
+                self.records[entry_id] = record
+                if len(self.records) > RECORD_CACHE_SIZE:
+                    self.records.popitem(last=False)
+        return record
+
+    def get_entry(self, entry_id):
+        """Return the full entry dict, paging it in from disk if needed"""
+        with self.lock:
+            entry = self.bodies.get(entry_id)
+            if entry is not None:
+                self.bodies.move_to_end(entry_id)
+                return entry
+            row = self.db.execute(
+                'SELECT id, timestamp, content, analysis, related_searches, reinforcement_score, usage_count, extra '
+                'FROM entries WHERE id = ?', (entry_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(entry_id)
+            entry = self._row_to_entry(row)
+            self.bodies[entry_id] = entry
+            if len(self.bodies) > BODY_CACHE_SIZE:
+                self.bodies.popitem(last=False)
+        return entry
+
+    def iter_entries(self):
+        """Yield every entry in id order, a few hundred rows at a time"""
+        rows = self._scan('id, timestamp, content, analysis, related_searches, reinforcement_score, usage_count, extra')
+        while True:
+            with self.lock:
+                row = next(rows, None)
+            if row is None:
+                return
+            yield self._row_to_entry(row)
+
+    def postings(self, term):
+        """Return [(entry_id, tf, length, reinforcement_score)] for entries containing term"""
+        with self.lock:
+            return self.db.execute(
+                'SELECT p.entry_id, p.tf, e.length, e.reinforcement_score FROM postings p '
+                'JOIN entries e ON e.id = p.entry_id WHERE p.term = ?', (term,)
+            ).fetchall()
+
+    def posting_count(self, term):
+        with self.lock:
+            return self.db.execute('SELECT COUNT(*) FROM postings WHERE term = ?', (term,)).fetchone()[0]
+
+    def topic_postings(self, term):
+        """Return [(entry_id, reinforcement_score)] for entries with term in their key topics"""
+        with self.lock:
+            return self.db.execute(
+                'SELECT t.entry_id, e.reinforcement_score FROM topic_postings t '
+                'JOIN entries e ON e.id = t.entry_id WHERE t.term = ?', (term,)
+            ).fetchall()
+
+    def top_concepts(self, limit=3):
+        with self.lock:
+            rows = self.db.execute('SELECT topic FROM learned_concepts ORDER BY count DESC LIMIT ?', (limit,)).fetchall()
+        return [topic for (topic,) in rows]
+
+    def document_frequencies(self, terms=None):
+        """Return ({term: number of entries containing it}, entry count)
+
+        Counts come from the BM25 postings. With terms=None every term is
+        returned, e.g. as a snapshot for bulk feed workers.
+        """
+        with self.lock:
+            if terms is None:
+                rows = self.db.execute('SELECT term, COUNT(*) FROM postings GROUP BY term').fetchall()
+            else:
+                terms = list(terms)
+                rows = []
+                # Stay under SQLite's bound-parameter limit
+                for start in range(0, len(terms), 500):
+                    batch = terms[start:start + 500]
+                    rows.extend(self.db.execute(
+                        f"SELECT term, COUNT(*) FROM postings WHERE term IN ({','.join('?' * len(batch))}) GROUP BY term", batch
+                    ).fetchall())
+            document_count = self.doc_count
+        return dict(rows), document_count
+
+    def rebuild_postings(self):
+        """Re-index every stored entry for BM25 retrieval"""
+        with self.lock, self.db:
+            self.db.execute('DELETE FROM postings')
+            self.db.execute('DELETE FROM topic_postings')
+            for entry_id, content, analysis in self._scan('id, content, analysis'):
+                self._index_entry(entry_id, content or '', json.loads(analysis) if analysis else {})
+            self.doc_count, self.total_length = self.db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(length), 0) FROM entries'
+            ).fetchone()
+            self._set_corpus_totals()
+            self._set_meta('postings', datetime.now().isoformat())
+
+    def count(self):
+        with self.lock:
+            return self.db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def _insert_entry(self, entry):
+        """Insert an entry row; an existing 'id' is kept, otherwise one is assigned"""
+        extra = {key: value for key, value in entry.items() if key not in ENTRY_COLUMNS and key != 'id'}
+        cursor = self.db.execute(
+            'INSERT INTO entries (id, timestamp, content, analysis, related_searches, reinforcement_score, usage_count, extra) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                entry.get('id'),
+                entry.get('timestamp', datetime.now().isoformat()),
+                entry.get('content', ''),
+                json.dumps(entry.get('analysis', {})),
+                json.dumps(entry.get('related_searches', [])),
+                entry.get('reinforcement_score', 1.0),
+                entry.get('usage_count', 0),
+                json.dumps(extra) if extra else None
+            )
+        )
+        return cursor.lastrowid
+
+    def _set_corpus_totals(self):
+        self._set_meta('doc_count', str(self.doc_count))
+        self._set_meta('total_length', str(self.total_length))
+
+    def _scan(self, columns, batch_size=500):
+        """Yield entry rows (id first) in id order without loading the whole table"""
+        last_id = 0
+        while True:
+            rows = self.db.execute(
+                f'SELECT {columns} FROM entries WHERE id > ? ORDER BY id LIMIT ?', (last_id, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last_id = rows[-1][0]
+
+    def _index_entry(self, entry_id, content, analysis):
+        """Write an entry's postings and length; returns the length in tokens"""
+        tokens = tokenize(content)
+        self.db.executemany(
+            'INSERT OR REPLACE INTO postings (term, entry_id, tf) VALUES (?, ?, ?)',
+            ((term, entry_id, tf) for term, tf in Counter(tokens).items())
+        )
+        self.db.executemany(
+            'INSERT OR IGNORE INTO topic_postings (term, entry_id) VALUES (?, ?)',
+            ((term, entry_id) for topic in analysis.get('key_topics', []) for term in tokenize(topic))
+        )
+        self.db.execute('UPDATE entries SET length = ? WHERE id = ?', (len(tokens), entry_id))
+        return len(tokens)
+
+    def _row_to_entry(self, row):
+        entry_id, timestamp, content, analysis, related_searches, score, usage_count, extra = row
+        entry = json.loads(extra) if extra else {}
+        entry.update({
+            'id': entry_id,
+            'timestamp': timestamp,
+            'content': content,
+            'analysis': json.loads(analysis) if analysis else {'key_topics': [], 'word_count': 0, 'summary': ''},
+            'related_searches': json.loads(related_searches) if related_searches else [],
+            'reinforcement_score': score,
+            'usage_count': usage_count
+        })
+        return entry
+
+
+class ScoreWriter:
+    """Write-behind buffer for usage_count/reinforcement_score changes
+
+    Retrieval records small deltas here instead of touching the database on
+    every query. Deltas for the same entry are merged and written as
+    increments in one transaction when max_pending entries are dirty, every
+    flush_interval seconds, or on close, so at most flush_interval seconds of
+    reinforcement can be lost on a crash.
+    """
+
+    def __init__(self, store, flush_interval=30.0, max_pending=50):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='score-writer', daemon=True)
+        self.thread.start()
+
+    def record(self, entry_id, usage_delta=1, score_delta=0.0):
+        with self.lock:
+            usage, score = self.pending.get(entry_id, (0, 0.0))
+            self.pending[entry_id] = (usage + usage_delta, score + score_delta)
+            full = len(self.pending) >= self.max_pending
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write all pending deltas now"""
+        with self.lock:
+            deltas, self.pending = self.pending, {}
+        if not deltas:
+            return
+        try:
+            self.store.add_score_deltas(deltas)
+        except Exception as e:
+            print(f"Score save error: {e}")
+            # Keep the deltas for the next attempt
+            with self.lock:
+                for entry_id, (usage, score) in deltas.items():
+                    pending_usage, pending_score = self.pending.get(entry_id, (0, 0.0))
+                    self.pending[entry_id] = (usage + pending_usage, score + pending_score)
+
+    def close(self):
+        self.stopped.set()
+        self.thread.join(timeout=2)
+        self.flush()
+
+    def _run(self):
+        while not self.stopped.wait(self.flush_interval):
+            self.flush()
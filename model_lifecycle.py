@@ -0,0 +1,106 @@
+import atexit
+import re
+import threading
+import time
+import ollama
+from model_registry import get_model_registry
+
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+
+def keep_alive_seconds(keep_alive):
+    """Seconds for an Ollama keep_alive value ('30m', '1h30m', 600); negative means forever"""
+    if isinstance(keep_alive, (int, float)):
+        return float(keep_alive)
+    text = str(keep_alive).strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    sign = -1 if text.startswith('-') else 1
+    parts = DURATION_PATTERN.findall(text)
+    if not parts:
+        raise ValueError(f"Invalid keep_alive duration: {keep_alive}")
+    return sign * sum(float(value) * DURATION_UNITS[unit] for value, unit in parts)
+
+
+class ModelLifecycle:
+    """Keeps the chat model loaded in Ollama while the assistant is running
+
+    switch() preloads the model in a background thread, so startup work
+    overlaps with the model load instead of the first answer paying for it.
+    Every request passes keep_alive, and while the session is idle a
+    heartbeat re-pins the model at half the keep_alive period, so it is not
+    unloaded between turns. release() unloads it with keep_alive=0; it is
+    also registered with atexit for front ends that never call it. If the
+    process dies without releasing, Ollama still unloads the model once
+    keep_alive runs out. Every request here sends the same load options as
+    the chat requests, since a different num_ctx makes Ollama reload.
+    """
+
+    def __init__(self, keep_alive='30m'):
+        self.keep_alive = keep_alive
+        self.model = None
+        self.options = None
+        self.last_used = 0.0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.heartbeat = None
+        atexit.register(self.release)
+
+    def switch(self, model, options=None):
+        """Make model the pinned one with the given load options, releasing the previous model"""
+        with self.lock:
+            previous, self.model = self.model, model
+            previous_options, self.options = self.options, options
+        if previous == model and previous_options == options:
+            return
+        if previous is not None and previous != model:
+            self._unload(previous, previous_options)
+        get_model_registry().warm(model, keep_alive=self.keep_alive, options=options)
+        self.touch()
+        self._start_heartbeat()
+
+    def touch(self):
+        """Note a request that already refreshed keep_alive"""
+        self.last_used = time.time()
+
+    def release(self):
+        """Stop pinning and unload the model"""
+        self.stopped.set()
+        with self.lock:
+            model, self.model = self.model, None
+        if model is not None:
+            self._unload(model, self.options)
+
+    def _unload(self, model, options):
+        try:
+            ollama.generate(model=model, prompt='', keep_alive=0, options=options)
+        except Exception as e:
+            print(f"⚠️ Could not unload {model}: {e}")
+
+    def _start_heartbeat(self):
+        if self.heartbeat is not None and self.heartbeat.is_alive():
+            return
+        try:
+            seconds = keep_alive_seconds(self.keep_alive)
+        except ValueError as e:
+            print(f"⚠️ {e}")
+            return
+        if seconds <= 0:
+            return  # Negative keeps the model loaded until release; zero never pins
+        self.stopped.clear()
+        self.heartbeat = threading.Thread(target=self._heartbeat, args=(seconds / 2,), name='model-keepalive', daemon=True)
+        self.heartbeat.start()
+
+    def _heartbeat(self, interval):
+        while not self.stopped.wait(interval):
+            model = self.model
+            if model is None or time.time() - self.last_used < interval:
+                continue
+            try:
+                ollama.generate(model=model, prompt='', keep_alive=self.keep_alive, options=self.options)
+                self.touch()
+            except Exception as e:
+                print(f"⚠️ Model keep-alive failed: {e}")
@@ -0,0 +1,122 @@
+import threading
+import time
+import ollama
+
+FALLBACK_MODELS = ['phi3:mini', 'gemma:2b', 'llama2:latest']
+DEFAULT_MODEL = 'phi3:mini'
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def _model_name(model):
+    # Newer ollama clients return objects, older ones dicts with 'name' or 'model'
+    if isinstance(model, dict):
+        return model.get('model') or model.get('name')
+    return getattr(model, 'model', None) or getattr(model, 'name', None)
+
+
+def normalize_model_name(name):
+    """'llama2' and 'llama2:latest' are the same model"""
+    return name if ':' in name else f"{name}:latest"
+
+
+class ModelRegistry:
+    """Installed Ollama models, from the list/show endpoints, cached with a TTL
+
+    Checking a model this way costs one metadata request instead of loading
+    the model and generating a token, so picking among fallbacks never
+    cold-loads models that will not be used.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self._installed = None
+        self._listed_at = 0.0
+        self._details = {}
+
+    def installed(self, refresh=False):
+        """Return the set of installed model names; None if Ollama is unreachable"""
+        with self.lock:
+            if refresh or self._installed is None or time.time() - self._listed_at > self.ttl:
+                try:
+                    response = ollama.list()
+                    models = response.get('models', []) if isinstance(response, dict) else getattr(response, 'models', [])
+                    self._installed = {normalize_model_name(name) for name in map(_model_name, models) if name}
+                except Exception as e:
+                    print(f"⚠️ Could not list models: {e}")
+                    self._installed = None
+                self._listed_at = time.time()
+            return self._installed
+
+    def is_available(self, model, refresh=False):
+        installed = self.installed(refresh)
+        return installed is not None and normalize_model_name(model) in installed
+
+    def choose(self, preferred, fallbacks=FALLBACK_MODELS, refresh=False):
+        """Return the first installed model of preferred + fallbacks
+
+        If Ollama cannot be reached the preferred model is returned unchecked,
+        so startup does not stall; the first request reports the real error.
+        """
+        installed = self.installed(refresh)
+        if installed is None:
+            return preferred or DEFAULT_MODEL
+        for model in [preferred, *fallbacks]:
+            if model and normalize_model_name(model) in installed:
+                return model
+        return preferred or DEFAULT_MODEL
+
+    def details(self, model):
+        """Return ollama.show() metadata for a model, cached for the TTL"""
+        with self.lock:
+            cached = self._details.get(model)
+            if cached and time.time() - cached[0] <= self.ttl:
+                return cached[1]
+        try:
+            info = ollama.show(model)
+        except Exception:
+            return None
+        with self.lock:
+            self._details[model] = (time.time(), info)
+        return info
+
+    def context_length(self, model):
+        """Return the model's trained context length, or None if unknown"""
+        info = self.details(model)
+        if info is None:
+            return None
+        model_info = info.get('model_info') if isinstance(info, dict) else getattr(info, 'modelinfo', None)
+        for key, value in (model_info or {}).items():
+            if key.endswith('.context_length'):
+                return int(value)
+        return None
+
+    def warm(self, model, background=True, keep_alive=None, options=None):
+        """Load a model into memory with an empty prompt, which generates nothing
+
+        Pass the same load options (num_ctx) the chat requests use, or the
+        first request reloads the model with its own.
+        """
+        def load():
+            try:
+                ollama.generate(model=model, prompt='', keep_alive=keep_alive, options=options)
+            except Exception as e:
+                print(f"⚠️ Model warm-up failed: {e}")
+
+        if not background:
+            load()
+            return None
+        thread = threading.Thread(target=load, name='model-warmup', daemon=True)
+        thread.start()
+        return thread
+
+
+def get_model_registry():
+    """Return the process-wide model registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
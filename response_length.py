@@ -0,0 +1,121 @@
+import json
+import os
+import threading
+from speech_pipeline import SENTENCE_BOUNDARY
+
+DETAILED_KEYWORDS = ['explain', 'details', 'information', 'tell me about', 'what is', 'how does', 'describe', 'news', 'current', 'latest']
+
+# Starting num_predict per query class, the old fixed lengths
+DEFAULT_BUDGETS = {'detailed_search': 250, 'search': 180, 'detailed': 150, 'short': 80}
+
+# The model starting the next turn itself instead of stopping. Only turn
+# markers stop a reply: lists, steps and poems continue after a blank line,
+# and a cut there would be recorded as a natural end and shrink the budget.
+STOP_SEQUENCES = ['\nUser:', '\nUser Question:', '\nYou:']
+
+
+class ResponseLengthController:
+    """Learns how many tokens each kind of query actually needs
+
+    Queries fall into the same four classes the fixed lengths used. After
+    every reply the tokens generated are recorded against what was asked
+    for: replies that ended on their own pull the class estimate toward
+    their length (an exponential moving average), and replies cut off at the
+    cap raise it. The next num_predict is the estimate plus headroom, so a
+    class whose answers run 60 tokens stops reserving 250, and one that keeps
+    hitting the cap gets more. Estimates persist in a small JSON file.
+    """
+
+    def __init__(self, path='response_lengths.json', alpha=0.3, headroom=1.3, growth=1.25, min_tokens=50, max_tokens=400):
+        self.path = path
+        self.alpha = alpha
+        self.headroom = headroom
+        self.growth = growth
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.lock = threading.Lock()
+        self.stats = self.load()
+
+    def load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+        except Exception:
+            print("⚠️ Response length stats corrupted - starting fresh")
+        return {}
+
+    def save(self):
+        try:
+            with self.lock:
+                data = json.dumps(self.stats, indent=2)
+            with open(self.path, 'w') as f:
+                f.write(data)
+        except Exception as e:
+            print(f"Response length save error: {e}")
+
+    def classify(self, user_input, search_results=None):
+        """Return the query class that decides the response length"""
+        wants_details = any(keyword in user_input.lower() for keyword in DETAILED_KEYWORDS)
+        if search_results:
+            return 'detailed_search' if wants_details else 'search'
+        return 'detailed' if wants_details else 'short'
+
+    def budget(self, query_class):
+        """Return num_predict for a query class"""
+        with self.lock:
+            stats = self.stats.get(query_class)
+        if not stats:
+            return DEFAULT_BUDGETS.get(query_class, DEFAULT_BUDGETS['short'])
+        return max(self.min_tokens, min(self.max_tokens, round(stats['estimate'] * self.headroom)))
+
+    def record(self, query_class, requested, generated, truncated):
+        """Record one reply: tokens asked for, tokens generated and whether the cap cut it off"""
+        with self.lock:
+            stats = self.stats.setdefault(query_class, {
+                'estimate': DEFAULT_BUDGETS.get(query_class, DEFAULT_BUDGETS['short']) / self.headroom,
+                'replies': 0,
+                'truncated': 0
+            })
+            stats['replies'] += 1
+            if truncated:
+                # The reply needed more than it got; how much more is unknown
+                stats['truncated'] += 1
+                stats['estimate'] = max(stats['estimate'], requested * self.growth / self.headroom)
+            else:
+                stats['estimate'] += self.alpha * (generated - stats['estimate'])
+        self.save()
+
+
+class SentenceTrimmer:
+    """Holds back an unfinished sentence near the token cap
+
+    Tokens pass straight through until the reply is within the last few
+    tokens of num_predict. From then on text is released one complete
+    sentence at a time, so if the cap cuts the reply off, the dangling
+    half-sentence is dropped instead of printed and spoken.
+    """
+
+    def __init__(self, num_predict, tail=40):
+        self.hold_after = max(num_predict - tail, num_predict // 2)
+        self.count = 0
+        self.held = ''
+
+    def feed(self, token):
+        """Add a streamed token and return the text that can be shown now"""
+        self.count += 1
+        if self.count < self.hold_after and not self.held:
+            return token
+        self.held += token
+        end = None
+        for match in SENTENCE_BOUNDARY.finditer(self.held):
+            end = match.end()
+        if end is None:
+            return ''
+        text, self.held = self.held[:end], self.held[end:]
+        return text
+
+    def finish(self, truncated):
+        """Return the held text, or nothing if the cap cut it off"""
+        held, self.held = self.held, ''
+        return '' if truncated else held
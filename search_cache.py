@@ -0,0 +1,107 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+
+# Seconds a cached result stays fresh, per provider
+DEFAULT_TTLS = {
+    'news': 15 * 60,
+    'web': 6 * 60 * 60,
+    'github': 24 * 60 * 60,
+    'wikipedia': 7 * 24 * 60 * 60,
+    'arxiv': 7 * 24 * 60 * 60,
+}
+
+# Queries about fast-moving topics get the short 'news' TTL whatever the provider
+NEWS_WORDS = {'news', 'latest', 'today', 'current', 'recent', 'happening', 'update'}
+
+
+def normalize_query(query):
+    """Normalize a query so trivially different phrasings share a cache entry"""
+    words = re.findall(r'\w+', query.lower())
+    return ' '.join(words)
+
+
+class SearchCache:
+    """Persistent SQLite cache of search results with per-provider TTLs
+
+    Entries are keyed by provider and normalized query. Expired entries are
+    still kept so a search that fails (for example when offline) can fall back
+    to the last known results.
+    """
+
+    def __init__(self, path='search_cache.db', ttls=None):
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.hits = {}
+        self.misses = {}
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS search_cache (
+                provider TEXT NOT NULL,
+                query TEXT NOT NULL,
+                results TEXT NOT NULL,
+                created REAL NOT NULL,
+                PRIMARY KEY (provider, query)
+            )
+        ''')
+        self.db.commit()
+
+    def ttl_for(self, provider, query):
+        """TTL in seconds for a provider/query pair"""
+        if NEWS_WORDS.intersection(query.split()):
+            return self.ttls['news']
+        return self.ttls.get(provider, self.ttls['web'])
+
+    def get(self, provider, query):
+        """Return cached results, or None when missing or expired"""
+        row = self._row(provider, query)
+        if row and time.time() - row[1] < self.ttl_for(provider, normalize_query(query)):
+            self.hits[provider] = self.hits.get(provider, 0) + 1
+            return json.loads(row[0])
+
+        self.misses[provider] = self.misses.get(provider, 0) + 1
+        return None
+
+    def put(self, provider, query, results):
+        """Store results for a provider/query pair"""
+        with self.lock:
+            self.db.execute(
+                'INSERT OR REPLACE INTO search_cache (provider, query, results, created) VALUES (?, ?, ?, ?)',
+                (provider, normalize_query(query), json.dumps(results), time.time())
+            )
+            self.db.commit()
+
+    def cached(self, provider, query, search):
+        """Return fresh cached results or run search(), falling back to stale results"""
+        results = self.get(provider, query)
+        if results is not None:
+            return results
+
+        try:
+            results = search()
+        except Exception:
+            results = []
+
+        if results:
+            self.put(provider, query, results)
+            return results
+
+        # Offline or nothing found: the last known answer beats no answer
+        row = self._row(provider, query)
+        return json.loads(row[0]) if row else results
+
+    def stats(self):
+        """Hit/miss counters per provider"""
+        providers = sorted(set(self.hits) | set(self.misses))
+        return {provider: {'hits': self.hits.get(provider, 0), 'misses': self.misses.get(provider, 0)} for provider in providers}
+
+    def _row(self, provider, query):
+        with self.lock:
+            return self.db.execute(
+                'SELECT results, created FROM search_cache WHERE provider = ? AND query = ?',
+                (provider, normalize_query(query))
+            ).fetchone()
@@ -0,0 +1,106 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class SearchExecutor:
+    """Run search providers concurrently with per-provider deadlines
+
+    Worst-case latency is bounded by the slowest deadline instead of the sum
+    of every provider's timeout, and a search returns as soon as enough
+    results have arrived. Hedged attempts run on a pool of their own: a
+    fan_out provider may itself wait on them, and waiting on work queued
+    behind it in the same pool could starve or deadlock.
+    """
+
+    def __init__(self, max_workers=16, hedge_workers=8):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='search')
+        self.hedge_pool = ThreadPoolExecutor(max_workers=hedge_workers, thread_name_prefix='search-hedge')
+
+    def fan_out(self, providers, enough=5):
+        """Run (name, function, deadline_seconds) providers at once
+
+        Results are returned in provider order. Providers that fail, miss their
+        deadline or are still running once enough results are in are skipped.
+        """
+        start = time.time()
+        futures = {}
+        for name, function, deadline in providers:
+            futures[self.pool.submit(function)] = (name, start + deadline)
+
+        results = {}
+        result_count = 0
+        pending = set(futures)
+        while pending and result_count < enough:
+            now = time.time()
+            # Drop providers whose deadline has passed
+            for future in [f for f in pending if futures[f][1] <= now]:
+                pending.discard(future)
+                print(f"⏱️ {futures[future][0]} search timed out")
+            if not pending:
+                break
+
+            next_deadline = min(futures[f][1] for f in pending)
+            done, pending = wait(pending, timeout=next_deadline - now, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future][0]
+                try:
+                    found = future.result()
+                except Exception:
+                    continue
+                if found:
+                    results[name] = found
+                    result_count += len(found)
+
+        merged = []
+        for name, _, _ in providers:
+            merged.extend(results.get(name, []))
+        return merged[:enough]
+
+    def hedged(self, attempts, hedge_delay=1.5, timeout=10):
+        """Return the first non-empty result from a list of equivalent searches
+
+        The first attempt starts immediately; each later one starts when the
+        previous ones have failed or come back empty, or after hedge_delay
+        seconds without an answer, whichever comes first.
+        """
+        start = time.time()
+        remaining = list(attempts)
+        pending = {self.hedge_pool.submit(remaining.pop(0))}
+        next_launch = start + hedge_delay
+
+        while pending or remaining:
+            if not pending:
+                pending.add(self.hedge_pool.submit(remaining.pop(0)))
+                next_launch = time.time() + hedge_delay
+
+            now = time.time()
+            if now >= start + timeout:
+                break
+            wait_until = min(next_launch, start + timeout) if remaining else start + timeout
+            done, pending = wait(pending, timeout=max(wait_until - now, 0), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                try:
+                    found = future.result()
+                except Exception:
+                    continue
+                if found:
+                    return found
+
+            # Nothing useful yet: hedge with the next attempt
+            if remaining and not done and time.time() >= next_launch:
+                pending.add(self.hedge_pool.submit(remaining.pop(0)))
+                next_launch = time.time() + hedge_delay
+
+        return []
+
+
+_executor = None
+
+
+def get_search_executor():
+    """Return the process-wide search executor"""
+    global _executor
+    if _executor is None:
+        _executor = SearchExecutor()
+    return _executor
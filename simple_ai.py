@@ -1,5 +1,6 @@
 import pyttsx3
 import ollama
+from model_registry import get_model_registry
 import time
 from datetime import datetime
 
@@ -10,11 +11,10 @@ class SimpleAI:
         self.tts.setProperty('rate', 200)
         
         print("Testing AI model...")
-        try:
-            test = ollama.generate(model='phi3:mini', prompt='Hi', options={'num_predict': 5})
+        if get_model_registry().is_available('phi3:mini'):
             print("✅ AI model working!")
-        except Exception as e:
-            print(f"❌ Model error: {e}")
+        else:
+            print("❌ Model phi3:mini not available")
             print("Make sure to run: ollama pull phi3:mini")
     
     def speak(self, text):
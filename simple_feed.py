@@ -1,6 +1,5 @@
-import json
-import os
 from datetime import datetime
+from knowledge_store import KnowledgeStore
 
 # Create knowledge base entry directly
 identity_data = {
@@ -16,26 +15,8 @@ identity_data = {
     'usage_count': 0
 }
 
-# Load or create knowledge base
-try:
-    if os.path.exists('ai_knowledge_base.json'):
-        with open('ai_knowledge_base.json', 'r') as f:
-            kb = json.load(f)
-    else:
-        kb = {'fed_data': [], 'learned_concepts': {}, 'reinforcement_scores': {}}
-except:
-    kb = {'fed_data': [], 'learned_concepts': {}, 'reinforcement_scores': {}}
-
-# Add identity data
-kb['fed_data'].append(identity_data)
-
-# Update learned concepts
-for topic in identity_data['analysis']['key_topics']:
-    kb['learned_concepts'][topic] = kb['learned_concepts'].get(topic, 0) + 1
-
-# Save knowledge base
-with open('ai_knowledge_base.json', 'w') as f:
-    json.dump(kb, f, indent=2)
+# Add identity data (also counts its topics as learned concepts)
+KnowledgeStore().add_entry(identity_data)
 
 print("Identity information fed successfully!")
 print("AI now has correct information about Shaik Davood")
\ No newline at end of file
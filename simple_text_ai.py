@@ -5,6 +5,7 @@ except ImportError:
 import ollama
 import time
 from datetime import datetime
+from model_registry import get_model_registry
 
 class SimpleTextAI:
     def __init__(self):
@@ -19,14 +20,7 @@ class SimpleTextAI:
     
     def get_model(self):
         """Get working model"""
-        models = ['phi3:mini', 'gemma:2b', 'llama2:latest']
-        for model in models:
-            try:
-                ollama.generate(model=model, prompt='test', options={'num_predict': 1})
-                return model
-            except:
-                continue
-        return 'phi3:mini'
+        return get_model_registry().choose('phi3:mini')
     
     def search_web(self, query):
         """Simple web search"""
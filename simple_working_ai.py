@@ -4,6 +4,7 @@ try:
 except ImportError:
     from duckduckgo_search import DDGS
 import ollama
+from model_registry import get_model_registry
 import time
 import json
 import os
@@ -43,23 +44,9 @@ class SimpleWorkingAI:
     
     def get_working_model(self):
         """Get a working model"""
-        models = ['phi3:mini', 'gemma:2b', 'llama2:latest']
-        
-        for model in models:
-            try:
-                print(f"Testing {model}...")
-                result = ollama.generate(
-                    model=model, 
-                    prompt='Hi', 
-                    options={'num_predict': 5}
-                )
-                print(f"✅ {model} works!")
-                return model
-            except Exception as e:
-                print(f"❌ {model} failed: {e}")
-        
-        print("⚠️ No models working - using phi3:mini anyway")
-        return 'phi3:mini'
+        model = get_model_registry().choose('phi3:mini')
+        print(f"✅ Using {model}")
+        return model
     
     def speak(self, text):
         """Simple speech"""
@@ -0,0 +1,116 @@
+import queue
+import re
+import threading
+import types
+
+# Sentence ends at ., ! or ? followed by whitespace (keeps "3.5" and "e.g" intact)
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])["\')\]]*\s+')
+
+
+class SentenceSplitter:
+    """Accumulate streamed tokens and cut them into complete sentences"""
+
+    def __init__(self, min_length=12):
+        self.buffer = ""
+        self.min_length = min_length
+
+    def feed(self, token):
+        """Add a token and return any sentences it completed"""
+        self.buffer += token
+        sentences = []
+        start = 0
+        for match in SENTENCE_BOUNDARY.finditer(self.buffer):
+            sentence = self.buffer[start:match.end()].strip()
+            # Merge very short fragments ("Hi." / "1.") into the next sentence
+            if len(sentence) < self.min_length:
+                continue
+            sentences.append(sentence)
+            start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self):
+        """Return whatever text is left once the stream has ended"""
+        rest = self.buffer.replace('\n', ' ').strip()
+        self.buffer = ""
+        return rest
+
+
+class SpeechPipeline:
+    """Speak a reply sentence by sentence while it is still being generated
+
+    Tokens are split into sentences on the caller's thread, a synthesis worker
+    turns each sentence into audio and a playback worker plays the audio in
+    order, so generation, synthesis and playback of different sentences overlap.
+    Backends that synthesize and play in one call (pyttsx3) pass synthesize=None
+    and receive the sentence text in play(). A synthesize() generator may yield
+    several audio chunks per sentence; each is played as soon as it arrives.
+    init_playback runs first on the playback worker, for engines that must be
+    created on the thread that uses them.
+    """
+
+    def __init__(self, synthesize, play, init_playback=None):
+        self.synthesize = synthesize
+        self.play = play
+        self.init_playback = init_playback
+        self.splitter = SentenceSplitter()
+        self.sentence_queue = queue.Queue()
+        self.audio_queue = queue.Queue()
+
+        if self.synthesize is not None:
+            threading.Thread(target=self._synthesis_worker, daemon=True).start()
+        threading.Thread(target=self._playback_worker, daemon=True).start()
+
+    def feed(self, token):
+        """Feed one streamed token; complete sentences are queued for speech"""
+        for sentence in self.splitter.feed(token):
+            self._queue_sentence(sentence)
+
+    def speak(self, text):
+        """Queue a complete text and wait until it has been spoken"""
+        self.feed(text)
+        self.finish()
+
+    def finish(self):
+        """Queue the trailing sentence and block until everything is played"""
+        rest = self.splitter.flush()
+        if rest:
+            self._queue_sentence(rest)
+        self.sentence_queue.join()
+        self.audio_queue.join()
+
+    def _queue_sentence(self, sentence):
+        if self.synthesize is None:
+            self.audio_queue.put(sentence)
+        else:
+            self.sentence_queue.put(sentence)
+
+    def _synthesis_worker(self):
+        while True:
+            sentence = self.sentence_queue.get()
+            try:
+                audio = self.synthesize(sentence)
+                if isinstance(audio, types.GeneratorType):
+                    for chunk in audio:
+                        self.audio_queue.put(chunk)
+                elif audio is not None:
+                    self.audio_queue.put(audio)
+            except Exception as e:
+                print(f"Speech synthesis error: {e}")
+            finally:
+                self.sentence_queue.task_done()
+
+    def _playback_worker(self):
+        if self.init_playback is not None:
+            try:
+                self.init_playback()
+            except Exception as e:
+                print(f"Speech engine setup error: {e}")
+        while True:
+            audio = self.audio_queue.get()
+            try:
+                self.play(audio)
+            except Exception as e:
+                print(f"Speech playback error: {e}")
+            finally:
+                self.audio_queue.task_done()
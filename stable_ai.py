@@ -4,29 +4,23 @@ import time
 import json
 import os
 import asyncio
+import io
 import sys
+import tempfile
 from datetime import datetime
 
-try:
-    import pygame
-except ImportError:
-    try:
-        import pygame_ce as pygame
-    except ImportError:
-        pygame = None
-
 try:
     import edge_tts
 except ImportError:
     edge_tts = None
 
+from audio_engine import get_playback_engine
+from model_registry import get_model_registry
+
 class StableAI:
     def __init__(self):
         print("🤖 Initializing Stable AI System...")
         
-        # Auto-cleanup on startup
-        self.auto_cleanup()
-        
         # Core variables
         self.conversation_history = []
         self.edge_available = False
@@ -85,6 +79,7 @@ class StableAI:
         
         try:
             self.voice = self.settings.get("voice", "en-US-AriaNeural")
+            self.audio_engine = get_playback_engine()
             self.edge_available = True
             print(f"🔊 TTS Ready - Voice: {self.voice}")
         except:
@@ -92,22 +87,7 @@ class StableAI:
     
     def safe_setup_model(self):
         """Setup AI model with fallbacks"""
-        models_to_try = [
-            self.settings.get("ai_model", "phi3:mini"),
-            "phi3:mini",
-            "gemma:2b", 
-            "llama2:latest"
-        ]
-        
-        for model in models_to_try:
-            try:
-                ollama.generate(model=model, prompt='test', options={'num_predict': 1})
-                self.model = model
-                return
-            except:
-                continue
-        
-        self.model = "phi3:mini"  # Fallback
+        self.model = get_model_registry().choose(self.settings.get("ai_model", "phi3:mini"))
     
     def safe_speak(self, text):
         """Safe speech with error handling"""
@@ -127,33 +107,28 @@ class StableAI:
                 return
             
             communicate = edge_tts.Communicate(clean_text, self.voice)
-            temp_file = f"temp_speech_{int(time.time())}.mp3"
-            
-            await communicate.save(temp_file)
-            
-            # Try pygame first
-            if pygame:
-                try:
-                    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-                    pygame.mixer.music.load(temp_file)
-                    pygame.mixer.music.play()
-                    
-                    while pygame.mixer.music.get_busy():
-                        await asyncio.sleep(0.1)
-                    
-                    pygame.mixer.music.stop()
-                    pygame.mixer.quit()
-                except:
-                    # Fallback to system player
-                    if sys.platform == "win32":
-                        os.startfile(temp_file)
-                        await asyncio.sleep(2)
+            audio = io.BytesIO()
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    audio.write(chunk["data"])
+            audio.seek(0)
             
-            # Cleanup
+            # Try the shared playback engine first
             try:
-                os.remove(temp_file)
+                await asyncio.to_thread(self.audio_engine.play, audio)
             except:
-                pass
+                # Fallback to system player, which needs a real file
+                if sys.platform == "win32":
+                    with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as f:
+                        f.write(audio.getvalue())
+                    try:
+                        os.startfile(f.name)
+                        await asyncio.sleep(2)
+                    finally:
+                        try:
+                            os.remove(f.name)
+                        except OSError:
+                            pass  # Still open in the player
                 
         except:
             pass  # Silent fail
@@ -214,49 +189,6 @@ class StableAI:
         except Exception as e:
             return f"I encountered an issue: {str(e)[:100]}"
     
-    def auto_cleanup(self):
-        """Automatic cleanup of unwanted files"""
-        unwanted_patterns = [
-            'temp_speech_*.mp3',
-            '*.tmp',
-            '*.log',
-            '__pycache__',
-            '*.pyc',
-            '.DS_Store',
-            'Thumbs.db'
-        ]
-        
-        unwanted_files = [
-            'temp_speech.mp3',
-            'test_edge_neural.mp3'
-        ]
-        
-        cleaned = 0
-        
-        # Remove specific unwanted files
-        for file in unwanted_files:
-            if os.path.exists(file):
-                try:
-                    os.remove(file)
-                    cleaned += 1
-                except:
-                    pass
-        
-        # Remove temp speech files
-        try:
-            for file in os.listdir('.'):
-                if file.startswith('temp_speech_') and file.endswith('.mp3'):
-                    try:
-                        os.remove(file)
-                        cleaned += 1
-                    except:
-                        pass
-        except:
-            pass
-        
-        if cleaned > 0:
-            print(f"🧹 Auto-cleaned {cleaned} temporary files")
-    
     def manual_cleanup(self):
         """Manual cleanup command"""
         print("🧹 Running manual cleanup...")
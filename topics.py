@@ -0,0 +1,51 @@
+import heapq
+import math
+import re
+from collections import Counter
+from knowledge_index import STOP_WORDS
+
+# Topic candidates: words of 4+ characters that start with a letter, punctuation stripped
+TOPIC_PATTERN = re.compile(r"[a-z][a-z0-9]{3,}")
+
+TOPIC_STOP_WORDS = STOP_WORDS | {
+    'also', 'been', 'from', 'have', 'into', 'more', 'most', 'only', 'other', 'over',
+    'some', 'such', 'than', 'that', 'their', 'them', 'then', 'there', 'these', 'they',
+    'this', 'those', 'very', 'were', 'what', 'when', 'which', 'while', 'with', 'would',
+    'could', 'should', 'about', 'after', 'before', 'being', 'each', 'just', 'like', 'many'
+}
+
+
+def topic_terms(text):
+    """Lowercase candidate topic words of text"""
+    return [word for word in TOPIC_PATTERN.findall(text.lower()) if word not in TOPIC_STOP_WORDS]
+
+
+def extract_topics(text, limit=5, document_frequencies=None, document_count=0):
+    """Return the top topic words of text
+
+    Words are ranked by frequency, or by TF-IDF when corpus document
+    frequencies are given, so words common to every fed document stop
+    crowding out the ones that identify this one.
+    """
+    counts = Counter(topic_terms(text))
+    if not document_frequencies or not document_count:
+        return [word for word, _ in counts.most_common(limit)]
+
+    def tf_idf(item):
+        word, count = item
+        return count * (math.log((document_count + 1) / (document_frequencies.get(word, 0) + 1)) + 1)
+
+    return [word for word, _ in heapq.nlargest(limit, counts.items(), key=tf_idf)]
+
+
+def analyze_text(content, document_frequencies=None, document_count=0):
+    """Analyze content to extract key information"""
+    try:
+        return {
+            'key_topics': extract_topics(content, 5, document_frequencies, document_count),
+            'word_count': len(content.split()),
+            'summary': content[:200] + '...' if len(content) > 200 else content
+        }
+    except Exception as e:
+        print(f"Content analysis error: {e}")
+        return {'key_topics': [], 'word_count': 0, 'summary': ''}
@@ -0,0 +1,134 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+
+class TTSCache:
+    """Content-addressed cache of synthesized speech
+
+    Audio is keyed by a hash of (voice, rate, text). Recently used clips stay
+    in memory; clips stored with persist=True (phrases spoken every session)
+    are also written to cache_dir so they survive restarts. Both tiers are
+    size-bounded and evict the least recently used clips.
+    """
+
+    def __init__(self, cache_dir='tts_cache', max_memory_bytes=8 * 1024 * 1024, max_disk_bytes=64 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        self.disk = OrderedDict()
+        self.disk_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self._load_disk_index()
+
+    def key(self, voice, text, rate="+0%"):
+        """Hash a voice/rate/text triple into a cache key"""
+        return hashlib.sha256(f"{voice}|{rate}|{text}".encode('utf-8')).hexdigest()
+
+    def get(self, voice, text, rate="+0%"):
+        """Return cached audio bytes, or None on a miss"""
+        key = self.key(voice, text, rate)
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return self.memory[key]
+
+            if key in self.disk:
+                try:
+                    with open(self._path(key), 'rb') as f:
+                        audio = f.read()
+                    os.utime(self._path(key))
+                except OSError:
+                    self.disk_bytes -= self.disk.pop(key)
+                    self.misses += 1
+                    return None
+                self.disk.move_to_end(key)
+                self._remember(key, audio)
+                self.hits += 1
+                return audio
+
+            self.misses += 1
+            return None
+
+    def put(self, voice, text, audio, rate="+0%", persist=False):
+        """Store synthesized audio bytes in memory, and on disk if persist is set"""
+        key = self.key(voice, text, rate)
+        with self.lock:
+            self._remember(key, audio)
+            if not persist or key in self.disk:
+                return
+
+        # The file is written outside the lock so lookups never wait on disk
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temp name first so a crash never leaves a truncated clip
+            temp_path = self._path(key) + '.part'
+            with open(temp_path, 'wb') as f:
+                f.write(audio)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            print(f"TTS cache write error: {e}")
+            return
+        with self.lock:
+            if key in self.disk:
+                return
+            self.disk[key] = len(audio)
+            self.disk_bytes += len(audio)
+            self._evict_disk()
+
+    def prewarm(self, sentences, synthesize):
+        """Synthesize uncached sentences in a background thread"""
+        def worker():
+            for sentence in sentences:
+                try:
+                    synthesize(sentence)
+                except Exception as e:
+                    print(f"TTS cache prewarm error: {e}")
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        return thread
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def _remember(self, key, audio):
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return
+        self.memory[key] = audio
+        self.memory_bytes += len(audio)
+        while self.memory_bytes > self.max_memory_bytes and len(self.memory) > 1:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+
+    def _evict_disk(self):
+        while self.disk_bytes > self.max_disk_bytes and len(self.disk) > 1:
+            key, size = self.disk.popitem(last=False)
+            self.disk_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _load_disk_index(self):
+        """Index existing clips, oldest access first"""
+        try:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.mp3'):
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                    entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        except OSError:
+            return
+
+        for _, key, size in sorted(entries):
+            self.disk[key] = size
+            self.disk_bytes += size
+        self._evict_disk()
@@ -5,6 +5,7 @@ import threading
 import time
 import os
 from datetime import datetime
+from model_registry import get_model_registry
 
 class UpdatedAISystem:
     def __init__(self):
@@ -23,20 +24,12 @@ class UpdatedAISystem:
         print(f"🤖 AI System Ready - Using: {self.model}")
         
     def detect_best_model(self):
-        """Auto-detect fastest available model"""
-        models_to_try = ['gemma:2b', 'phi3:mini', 'llama2:latest']
-        
-        for model in models_to_try:
-            try:
-                start_time = time.time()
-                ollama.generate(model=model, prompt='Hi', options={'num_predict': 1})
-                response_time = time.time() - start_time
-                
-                if response_time < 5:  # If fast enough
-                    print(f"✅ Selected fast model: {model}")
-                    return model
-            except:
-                continue
+        """Pick the smallest installed model, which is the fastest"""
+        registry = get_model_registry()
+        for model in ['gemma:2b', 'phi3:mini', 'llama2:latest']:
+            if registry.is_available(model):
+                print(f"✅ Selected fast model: {model}")
+                return model
         
         print("⚠️ Using default model: phi3:mini")
         return 'phi3:mini'
@@ -0,0 +1,160 @@
+import os
+import queue
+import threading
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# int8 rows store round(v * 127) of the unit-length vector
+INT8_SCALE = 127.0
+DTYPES = ('float32', 'int8')
+
+
+def retain_vectors(keep_ids, path='knowledge_vectors'):
+    """Drop the rows of entries not in keep_ids from the stored index; returns the rows dropped
+
+    Rows have a fixed size, so the files are rewritten directly without
+    numpy or the embedding model. Run it while no VectorIndex has them open.
+    """
+    ids_path = f"{path}.ids"
+    if not os.path.exists(ids_path):
+        return 0
+    with open(ids_path, 'r') as f:
+        ids = [int(line) for line in f if line.strip()]
+    rows = [row for row, entry_id in enumerate(ids) if entry_id in keep_ids]
+    if len(rows) == len(ids):
+        return 0
+
+    for dtype in DTYPES:
+        matrix_path = f"{path}.{dtype}"
+        if not os.path.exists(matrix_path):
+            continue
+        row_size = os.path.getsize(matrix_path) // len(ids)
+        with open(matrix_path, 'rb') as source, open(f"{matrix_path}.compact", 'wb') as target:
+            for row in rows:
+                source.seek(row * row_size)
+                target.write(source.read(row_size))
+        os.replace(f"{matrix_path}.compact", matrix_path)
+    with open(f"{ids_path}.compact", 'w') as f:
+        f.writelines(f"{ids[row]}\n" for row in rows)
+    os.replace(f"{ids_path}.compact", ids_path)
+    return len(ids) - len(rows)
+
+
+class VectorIndex:
+    """Optional embedding index for semantic retrieval over fed knowledge
+
+    Embeddings are L2-normalized and appended to a flat binary matrix
+    (float32, or int8 for a quarter of the size) next to a list of entry ids.
+    Adding an entry is an append, and search memory-maps the matrix and ranks
+    rows by dot product, so only the pages actually touched are read.
+    """
+
+    def __init__(self, embed, path='knowledge_vectors', dtype='float32', chunk_rows=65536):
+        if np is None:
+            raise ImportError("numpy is required for semantic search - Run: pip install numpy")
+        self.embed = embed
+        self.matrix_path = f"{path}.{dtype}"
+        self.ids_path = f"{path}.ids"
+        self.dtype = np.dtype(dtype)
+        self.chunk_rows = chunk_rows
+        self.lock = threading.Lock()
+        self.ids = []
+        self.dim = None
+        self._matrix = None
+        self.jobs = queue.Queue()
+        self.worker = None
+
+        if os.path.exists(self.ids_path) and os.path.exists(self.matrix_path):
+            with open(self.ids_path, 'r') as f:
+                self.ids = [int(line) for line in f if line.strip()]
+            if self.ids:
+                self.dim = os.path.getsize(self.matrix_path) // (self.dtype.itemsize * len(self.ids))
+        self.id_set = set(self.ids)
+
+    def __contains__(self, entry_id):
+        return entry_id in self.id_set
+
+    def add(self, entry_id, text):
+        """Embed text and append it under entry_id"""
+        vector = self._normalize(self.embed(text))
+        with self.lock:
+            if entry_id in self.id_set:
+                return
+            if self.dim is None:
+                self.dim = len(vector)
+            elif len(vector) != self.dim:
+                raise ValueError(f"Embedding size {len(vector)} does not match index size {self.dim}")
+
+            with open(self.matrix_path, 'ab') as f:
+                f.write(self._encode(vector).tobytes())
+            with open(self.ids_path, 'a') as f:
+                f.write(f"{entry_id}\n")
+            self.ids.append(entry_id)
+            self.id_set.add(entry_id)
+            self._matrix = None  # Re-map to include the new row
+
+    def backfill(self, entries):
+        """Queue entries to be embedded if they are not indexed yet
+
+        A single background worker embeds queued batches in order. entries
+        may be a lazy iterator; it is consumed by the worker.
+        """
+        with self.lock:
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._backfill_worker, name='embedding-backfill', daemon=True)
+                self.worker.start()
+        self.jobs.put(entries)
+
+    def _backfill_worker(self):
+        while True:
+            entries = self.jobs.get()
+            for entry in entries:
+                if entry.get('id') in self.id_set:
+                    continue
+                try:
+                    self.add(entry['id'], entry.get('content', ''))
+                except Exception as e:
+                    print(f"Embedding backfill error: {e}")
+                    break  # Skip the rest of this batch; the next startup retries it
+
+    def search(self, query, limit=2, min_similarity=0.5):
+        """Return [(entry_id, cosine similarity)] of the closest entries"""
+        with self.lock:
+            matrix = self._map()
+            ids = list(self.ids)
+        if matrix is None or not ids:
+            return []
+
+        query_vector = self._normalize(self.embed(query))
+        if len(query_vector) != self.dim:
+            return []
+
+        # Score in chunks so int8 rows are widened a block at a time, not all at once
+        scores = np.empty(len(ids), dtype=np.float32)
+        for start in range(0, len(ids), self.chunk_rows):
+            block = np.asarray(matrix[start:start + self.chunk_rows], dtype=np.float32)
+            scores[start:start + len(block)] = block @ query_vector
+        if self.dtype == np.int8:
+            scores /= INT8_SCALE
+
+        limit = min(limit, len(ids))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(ids[i], float(scores[i])) for i in top if scores[i] >= min_similarity]
+
+    def _map(self):
+        if self._matrix is None and self.ids:
+            self._matrix = np.memmap(self.matrix_path, dtype=self.dtype, mode='r', shape=(len(self.ids), self.dim))
+        return self._matrix
+
+    def _normalize(self, vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _encode(self, vector):
+        if self.dtype == np.int8:
+            return np.round(vector * INT8_SCALE).astype(np.int8)
+        return vector.astype(self.dtype)
@@ -1,13 +1,13 @@
 import streamlit as st
 import requests
-from ai_system import FreeAISystem
+from ai_system import DefaultAISystem
 import threading
 import time
 
 # Initialize AI system
 @st.cache_resource
 def get_ai_system():
-    return FreeAISystem()
+    return DefaultAISystem()
 
 def main():
     st.title("🤖 Free AI Assistant")
@@ -41,12 +41,10 @@ def main():
             with st.chat_message("user"):
                 st.markdown(prompt)
             
-            # Get AI response
+            # Stream AI response as tokens arrive
             with st.chat_message("assistant"):
-                with st.spinner("Thinking..."):
-                    response = ai.generate_response(prompt)
-                    st.markdown(response)
-                    st.session_state.messages.append({"role": "assistant", "content": response})
+                response = st.write_stream(ai.generate_response_stream(prompt))
+                st.session_state.messages.append({"role": "assistant", "content": response})
     
     elif feature == "🔍 Web Search":
         st.header("Web Search + AI Analysis")
@@ -7,6 +7,8 @@ import time
 import json
 import os
 from datetime import datetime
+from knowledge_store import KnowledgeStore
+from model_registry import get_model_registry
 
 class WorkingAI:
     def __init__(self):
@@ -34,26 +36,14 @@ class WorkingAI:
     
     def load_knowledge_base(self):
         try:
-            if os.path.exists('ai_knowledge_base.json'):
-                with open('ai_knowledge_base.json', 'r') as f:
-                    return json.load(f)
+            return KnowledgeStore().load()
         except:
             pass
         return {'fed_data': [], 'learned_concepts': {}}
     
     def get_model(self):
-        try:
-            model = self.settings["ai_model"]
-            ollama.generate(model=model, prompt='test', options={'num_predict': 1})
-            return model
-        except:
-            for model in ['phi3:mini', 'gemma:2b', 'llama2:latest']:
-                try:
-                    ollama.generate(model=model, prompt='test', options={'num_predict': 1})
-                    return model
-                except:
-                    continue
-            return 'phi3:mini'
+        model = get_model_registry().choose(self.settings["ai_model"])
+        return model
     
     def search_web(self, query):
         if not self.settings["search_enabled"]: